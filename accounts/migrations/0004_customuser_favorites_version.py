@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_customuser_gender'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='favorites_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
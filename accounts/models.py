@@ -16,5 +16,8 @@ class CustomUser(AbstractUser):
         verbose_name='성별'
     )
 
+    # 즐겨찾기가 바뀔 때마다 1씩 증가 (ETag / 사용자별 캐시 무효화용)
+    favorites_version = models.PositiveIntegerField(default=0, editable=False)
+
     def __str__(self):
         return self.username
\ No newline at end of file
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # 반드시 최상단 근처
+    'toons.metrics.MetricsMiddleware',  # 엔드포인트별 지연 시간/쿼리 수 (/api/metrics)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,6 +89,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 기본은 프로세스 로컬 메모리. 여러 프로세스가 캐시를 공유하려면 환경변수로 교체
+# (예: DJANGO_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache,
+#      DJANGO_CACHE_LOCATION=redis://127.0.0.1:6379)
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'webtoon-service'),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -130,6 +146,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 WEBTOON_API_BASE = "https://korea-webtoon-api.onrender.com/"
 WEBTOON_API_TIMEOUT = 6  # seconds
+WEBTOON_CATALOG_CSV = BASE_DIR / 'crawling' / 'all_webtoons.csv'
+WEBTOON_GENRE_CLUSTERS_CSV = BASE_DIR / 'crawling' / 'final_40_grouped_genres.csv'  # 원본 장르 → 40개 묶음
+WEBTOON_TAG_TRANSLATION_CSV = BASE_DIR / 'crawling' / 'tag_translation_cache.csv'  # 영문 태그 → 한글
+WEBTOON_ARTIFACT_DIR = BASE_DIR / 'artifacts'  # build_similarity 등이 만드는 결과물
+WEBTOON_RESPONSE_CACHE_TIMEOUT = 60 * 60  # seconds (키에 카탈로그 버전이 들어가므로 길게 잡아도 됨)
+WEBTOON_HISTORY_SIZE = 50  # 사용자당 남기는 최근 본 웹툰 수
+WEBTOON_HISTORY_FLUSH_SIZE = 200  # 조회 기록 버퍼가 이만큼 차면 바로 기록
+WEBTOON_HISTORY_FLUSH_SECONDS = 5  # 아니면 이 시간마다 기록
+WEBTOON_SLOW_REQUEST_MS = 500  # 이보다 느린 요청은 SQL 과 함께 경고 로그
+WEBTOON_SLOW_REQUEST_QUERIES = 50  # 쿼리가 이만큼 넘는 요청도 (N+1 의심)
+# /api/metrics 접근 (toons/metrics.py 참고). 기본은 staff 로그인만 허용
+WEBTOON_METRICS_TOKEN = os.environ.get('WEBTOON_METRICS_TOKEN', '')  # Authorization: Bearer <token>
+# REMOTE_ADDR 기준. 같은 호스트의 리버스 프록시 뒤에서는 모든 요청이 127.0.0.1 이므로 비워 둔다
+WEBTOON_METRICS_ALLOWED_IPS = [ip for ip in os.environ.get('WEBTOON_METRICS_ALLOWED_IPS', '').split(',') if ip]
+WEBTOON_METRICS_PUBLIC = os.environ.get('WEBTOON_METRICS_PUBLIC') == '1'  # 켜면 누구나 /api/metrics 조회
 
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# 첫 자동완성 요청이 색인을 만드느라 기다리지 않게 워커가 뜰 때 만든다
+from toons.suggest import warm_suggest_index  # noqa: E402
+
+warm_suggest_index()
@@ -75,4 +75,10 @@ const Api = {
         const query = new URLSearchParams(params).toString();
         return apiCall(`/me/favorites/${query ? '?' + query : ''}`);
     },
+    // 여러 개 한 번에: { add: [id...], remove: [id...] }
+    favoritesBatch: (changes) => apiCall('/me/favorites/batch', {
+        method: 'POST',
+        body: JSON.stringify(changes),
+    }),
+    favoriteStates: (ids) => apiCall(`/me/favorites/batch?ids=${ids.join(',')}`),
 };
\ No newline at end of file
@@ -2,12 +2,30 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Q
-from .models import Webtoon, Genre
-from .serializers import WebtoonSerializer
+from .models import Author, Webtoon, WebtoonAuthor, WebtoonTombstone
+from .serializers import WebtoonSerializer, apply_favorites
+from .catalog import ALL_PROVIDERS, catalog_ready, catalog_not_ready_response, get_catalog_version
+from .cache import cached_catalog_response, catalog_etag, not_modified
+from . import favorites as favorite_service
+from .artifacts import load_neighbors
+from .similarity import GENRE_SIMILARITY
+from .synopsis import SYNOPSIS_SIMILARITY
+from .recommendations import DEFAULT_LIMIT, MAX_LIMIT, recommend_for
+from .pagination import InvalidCursor, decode_cursor, paginate_by_cursor, cached_count
+from .search import search_webtoons
+from .facets import apply_facet_filters, facet_counts, parse_facet_filters
+from .schedule import DAYS, mask_to_days, masks_with, normalize_day
+from .works import attach_available_on, dedupe_works
+from .suggest import SUGGEST_LIMIT, SUGGEST_MAX_LIMIT, get_suggest_index
+from .history import history_size, recent_webtoons, record_view
+from .trending import WINDOWS, trending_webtoons
 import requests
+import time
 from django.core.paginator import Paginator
-import pandas as pd
+from django.db.models import Count
+from django.http import StreamingHttpResponse
+
+POPULAR_CACHE_SECONDS = 60
 
 # PLATFORM_API = {
 #     'NAVER': 'https://korea-webtoon-api.onrender.com/webtoons?provider=NAVER&page={page}&perPage=100&sort=ASC',
@@ -49,93 +67,430 @@ import pandas as pd
     
 #     print(f"{provider} 동기화 완료!")
 
-def import_webtoons_from_csv(csv_path: str):
-    df = pd.read_csv(csv_path)
-    df = df.fillna('')
-
-    created_count = 0
-
-    for row in df.itertuples(index=False):
-        webtoon, created = Webtoon.objects.get_or_create(
-            provider=row.provider,
-            title=row.titleName,
-            url=row.Url,
-            defaults={
-                'writers': row.Writer,
-                'painters': row.Painter,
-                'original_author': row.Original,
-                'update_days': row.day,
-                'thumbnail': row.thumbnailUrl,
-                'is_adult': bool(row.is_adult),
-                'synopsis': row.synopsis,
-            }
-        )
-
-        # 장르 M2M 연결
-        genre_text = row.genre
-        if genre_text:
-            names = [g.strip() for g in str(genre_text).split(',') if g.strip()]
-            for name in names:
-                genre_obj, _ = Genre.objects.get_or_create(tag=name)
-                webtoon.genres.add(genre_obj)
 
-        if created:
-            created_count += 1
+def _positive_int(params, name, default, maximum=None):
+    """1 이상 정수 쿼리 파라미터 (maximum 을 넘으면 maximum 으로). 잘못된 값이면 ValueError"""
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} 는 정수여야 합니다.')
+    if value < 1:
+        raise ValueError(f'{name} 는 1 이상이어야 합니다.')
+    return min(value, maximum) if maximum else value
 
-    return created_count
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def webtoon_list(request):
     """웹툰 목록 조회 (페이징 추가)"""
     provider = request.GET.get('provider', 'NAVER')
-    q = request.GET.get('q', '')
-    page_num = int(request.GET.get('page', 1))
-    per_page = int(request.GET.get('per_page', 100))  # 한 페이지에 100개씩
-    
-    # DB에 해당 플랫폼 웹툰이 없으면 동기화
-    if not Webtoon.objects.filter(provider=provider).exists():
-        # from .views import import_webtoons_from_csv
-        import_webtoons_from_csv(".\\crawling\\all_webtoons.csv")
-    
-    webtoons = Webtoon.objects.filter(provider=provider).exclude(update_days='').order_by('-id')
-    
-    # 카카오/카카오페이지는 연재중만
-    # if provider in ['KAKAO', 'KAKAOPAGE']:
-    # 성인웹툰은 빼고
-    webtoons = webtoons.filter(is_adult=False)
-    
-    # 검색
-    if q:
-        webtoons = webtoons.filter(
-            Q(title__icontains=q) # | Q(authors__icontains=q)
-        )
-    
-    # 페이징
-    paginator = Paginator(webtoons, per_page)
-    page_obj = paginator.get_page(page_num)
+    q = ' '.join(request.GET.get('q', '').split())
+    try:
+        page_num = int(request.GET.get('page', 1))
+        per_page = int(request.GET.get('per_page', 100))  # 한 페이지에 100개씩
+    except ValueError:
+        return Response({'error': 'page, per_page 는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if per_page < 1:
+        return Response({'error': 'per_page 는 1 이상이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    cursor_mode = 'cursor' in request.GET or request.GET.get('paginate') == 'cursor'
+    cursor = request.GET.get('cursor') or ''
+    with_count = request.GET.get('count') in ('1', 'true')
+    sort = request.GET.get('sort', 'latest')
+    segment = request.GET.get('segment', '').upper()
+    with_facets = request.GET.get('facets') in ('1', 'true')
+    dedupe = request.GET.get('dedupe') in ('1', 'true')
+    try:
+        filters = parse_facet_filters(request.GET)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
-    serializer = WebtoonSerializer(page_obj, many=True, context={'request': request})
+    # 적재는 warm_catalog 명령으로 미리 한다. 요청 중에는 절대 적재하지 않음
+    if not catalog_ready():
+        return catalog_not_ready_response()
+
+    if sort not in ('latest', 'popular'):
+        return Response({'error': 'sort 는 latest 또는 popular 만 가능합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+    if segment and segment not in favorite_service.GENDER_COUNTERS:
+        return Response({'error': 'segment 는 M 또는 F 만 가능합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # 인기순 cursor 는 (카운터, id) 로 이어 간다
+    sort_field = favorite_service.GENDER_COUNTERS.get(segment, 'favorites_count') if sort == 'popular' else None
+    if cursor_mode:
+        if q:
+            # 검색 관련도 순서는 cursor 로 이어 갈 키가 없다
+            return Response({'error': '검색어(q)와 cursor 페이징은 함께 쓸 수 없습니다. page 를 사용해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            decode_cursor(cursor, sort_field)
+        except InvalidCursor:
+            return Response({'error': '잘못된 cursor 입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build(version):
+        webtoons = Webtoon.objects.exclude(update_days='').order_by('-id')
+        # provider=ALL 이면 전체 플랫폼
+        if provider != ALL_PROVIDERS:
+            webtoons = webtoons.filter(provider=provider)
+        
+        # 카카오/카카오페이지는 연재중만
+        # if provider in ['KAKAO', 'KAKAOPAGE']:
+        # 장르/요일/작가 필터, 성인웹툰은 기본적으로 빼고 (adult=1|all 로 변경)
+        webtoons = apply_facet_filters(webtoons, filters)
+        
+        # 검색 (제목/작가/원작/줄거리, 관련도 순)
+        if q:
+            webtoons = search_webtoons(webtoons, q)
+
+        # 여러 플랫폼에 있는 같은 작품은 한 행만 (canonical_work 는 build_canonical_works 로 미리 계산)
+        if dedupe:
+            webtoons = dedupe_works(webtoons)
+
+        # 인기순 (segment=M/F 면 성별 인기순), provider + 카운터 인덱스를 탄다
+        if sort == 'popular':
+            webtoons = webtoons.order_by(f'-{sort_field}', '-id')
+        
+        # 사용자별 필드는 캐시 밖에서 채우므로 여기서는 조회하지 않음
+        context = {'request': request, 'favorite_ids': set()}
+
+        # 무한 스크롤용 cursor 페이징 (COUNT 없음, count=1 일 때만 캐시된 개수 포함)
+        if cursor_mode:
+            items, next_cursor = paginate_by_cursor(webtoons, cursor, per_page, sort_field)
+            data = {
+                'next': next_cursor,
+                'results': WebtoonSerializer(items, many=True, context=context).data,
+            }
+            if with_count:
+                data['count'] = cached_count(webtoons, version, provider, q, sorted(filters.items()))
+        else:
+            # 페이징
+            paginator = Paginator(webtoons, per_page)
+            page_obj = paginator.get_page(page_num)
+            
+            data = {
+                'count': paginator.count,
+                'total_pages': paginator.num_pages,
+                'current_page': page_num,
+                'results': WebtoonSerializer(page_obj, many=True, context=context).data,
+            }
+
+        # 적재 때 미리 계산해 둔 facet 별 개수
+        if with_facets:
+            data['facets'] = facet_counts(provider)
+        attach_available_on(data['results'])
+        return data
+
+    params = {'provider': provider, 'q': q, 'per_page': per_page, 'facets': with_facets, 'dedupe': dedupe, **filters}
+    if sort == 'popular':
+        # 인기 카운터는 토글마다 바뀌므로 카탈로그 버전 대신 1분 단위로 갱신
+        params.update(sort=sort, segment=segment, bucket=int(time.time() // POPULAR_CACHE_SECONDS))
+    if cursor_mode:
+        params.update(cursor=cursor, count=with_count)
+    else:
+        params.update(page=page_num)
+
+    # 탭 전환/뒤로가기 때 바뀐 게 없으면 직렬화 없이 304
+    version = get_catalog_version()
+    etag = catalog_etag(request, 'webtoon_list', params, version)
+    response = not_modified(request, etag)
+    if response:
+        return response
+
+    data = cached_catalog_response('webtoon_list', params, build, version=version)
+    apply_favorites(data['results'], request)
     
-    return Response({
-        'count': paginator.count,
-        'total_pages': paginator.num_pages,
-        'current_page': page_num,
-        'results': serializer.data
-    }, status=status.HTTP_200_OK)
+    response = Response(data, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def webtoon_suggest(request):
+    """검색창 자동완성 (제목/작가 이름 접두어, 초성 입력 가능, 인기순)"""
+    q = request.GET.get('q', '')
+    try:
+        limit = _positive_int(request.GET, 'limit', SUGGEST_LIMIT, SUGGEST_MAX_LIMIT)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not catalog_ready():
+        return catalog_not_ready_response()
+
+    data = get_suggest_index().suggest(q, limit)
+    return Response(data, status=status.HTTP_200_OK)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def webtoon_detail(request, webtoon_id):
     """웹툰 상세 조회"""
-    try:
-        webtoon = Webtoon.objects.get(id=webtoon_id)
-    except Webtoon.DoesNotExist:
+    def build(version):
+        webtoon = Webtoon.objects.filter(id=webtoon_id).first()
+        if webtoon is None:
+            return {}
+        data = WebtoonSerializer(webtoon, context={'request': request, 'favorite_ids': set()}).data
+        return attach_available_on([data])[0]
+
+    # 최근 본 웹툰 (메모리 버퍼에 모았다가 한 번에 기록, 없는 웹툰은 기록할 때 걸러진다)
+    # 다시 본 페이지는 대부분 304 로 끝나므로 ETag 확인보다 먼저 남긴다
+    record_view(request.user, webtoon_id)
+
+    params = {'id': webtoon_id}
+    version = get_catalog_version()
+    etag = catalog_etag(request, 'webtoon_detail', params, version)
+    response = not_modified(request, etag)
+    if response:
+        return response
+
+    data = cached_catalog_response('webtoon_detail', params, build, version=version)
+    if not data:
         return Response({'error': '웹툰을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
     
-    serializer = WebtoonSerializer(webtoon, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    apply_favorites([data], request)
+    response = Response(data, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def webtoon_trending(request):
+    """급상승 웹툰 (window 기간 동안 즐겨찾기 추가가 많은 순, 몇 분마다 다시 계산)"""
+    window = request.GET.get('window', '24h')
+    provider = request.GET.get('provider', ALL_PROVIDERS)
+    try:
+        limit = _positive_int(request.GET, 'limit', 20, 100)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if window not in WINDOWS:
+        return Response({'error': f"window 는 {', '.join(WINDOWS)} 중 하나여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not catalog_ready():
+        return catalog_not_ready_response()
+
+    webtoons, adds, refreshed_at = trending_webtoons(window, provider, limit)
+    results = WebtoonSerializer(webtoons, many=True, context={'request': request, 'favorite_ids': set()}).data
+    for item in results:
+        item['recent_favorites'] = adds[item['id']]
+    apply_favorites(results, request)
+    return Response({
+        'window': window,
+        'provider': provider,
+        'refreshed_at': refreshed_at,
+        'results': results,
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def webtoon_schedule(request):
+    """요일별 연재 목록 (day 가 없으면 일주일 전체를 요일별로)"""
+    provider = request.GET.get('provider', 'NAVER')
+    day = request.GET.get('day', '')
+    if day:
+        day = normalize_day(day)
+        if day is None:
+            return Response({'error': f"day 는 {', '.join(DAYS)} 중 하나여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if not catalog_ready():
+        return catalog_not_ready_response()
+
+    params = {'provider': provider, 'day': day}
+    version = get_catalog_version()
+    etag = catalog_etag(request, 'webtoon_schedule', params, version)
+    response = not_modified(request, etag)
+    if response:
+        return response
+
+    def build(version):
+        webtoons = Webtoon.objects.filter(provider=provider, is_adult=False)
+        context = {'request': request, 'favorite_ids': set()}
+
+        # 하루치: (provider, update_days_mask) 인덱스로 해당 요일 마스크만 조회
+        if day:
+            webtoons = webtoons.filter(update_days_mask__in=masks_with(day)).order_by('-id')
+            return {
+                'provider': provider,
+                'day': day,
+                'results': WebtoonSerializer(webtoons, many=True, context=context).data,
+            }
+
+        # 일주일치: 한 번에 읽어서 요일별로 나눈 결과를 통째로 캐시
+        webtoons = list(webtoons.filter(update_days_mask__gt=0).order_by('-id'))
+        items = WebtoonSerializer(webtoons, many=True, context=context).data
+        days = {d: [] for d in DAYS}
+        for webtoon, item in zip(webtoons, items):
+            for d in mask_to_days(webtoon.update_days_mask):
+                days[d].append(item)
+        return {'provider': provider, 'days': days}
+
+    data = cached_catalog_response('webtoon_schedule', params, build, version=version)
+    if day:
+        apply_favorites(data['results'], request)
+    else:
+        apply_favorites([item for items in data['days'].values() for item in items], request)
+
+    response = Response(data, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return response
+
+
+def _stream_ids(ids, batch_size=1000):
+    """id 이터레이터를 JSON 배열 내용(쉼표 구분) 조각으로 흘려 보낸다"""
+    batch = []
+    first = True
+    for pk in ids:
+        batch.append(str(pk))
+        if len(batch) >= batch_size:
+            yield ('' if first else ',') + ','.join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield ('' if first else ',') + ','.join(batch)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def webtoon_changes(request):
+    """since 리비전 이후 추가/변경/삭제된 웹툰 id (응답의 revision 을 다음 since 로 사용)"""
+    try:
+        since = int(request.GET.get('since', 0))
+    except ValueError:
+        return Response({'error': 'since 는 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    revision = get_catalog_version()
+    window = {'revision__gt': since, 'revision__lte': revision}
+    added = Webtoon.objects.filter(
+        created_revision__gt=since, created_revision__lte=revision,
+    ).order_by('id').values_list('id', flat=True)
+    changed = Webtoon.objects.filter(
+        created_revision__lte=since, **window,
+    ).order_by('id').values_list('id', flat=True)
+    removed = WebtoonTombstone.objects.filter(**window).order_by('webtoon_id').values_list(
+        'webtoon_id', flat=True,
+    ).distinct()
+
+    def stream():
+        yield f'{{"since":{since},"revision":{revision},"added":['
+        yield from _stream_ids(added.iterator(chunk_size=2000))
+        yield '],"changed":['
+        yield from _stream_ids(changed.iterator(chunk_size=2000))
+        yield '],"removed":['
+        yield from _stream_ids(removed.iterator(chunk_size=2000))
+        yield ']}'
+
+    return StreamingHttpResponse(stream(), content_type='application/json')
+
+
+def _neighbor_response(request, webtoon_id, name):
+    """미리 계산한 이웃 artifact 로 유사 웹툰 목록 응답 (artifact 가 없으면 503)"""
+    try:
+        limit = _positive_int(request.GET, 'limit', 10, 50)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    index = load_neighbors(name)
+    if index is None:
+        return Response({
+            'error': '유사 웹툰 정보를 준비 중입니다.',
+            'code': 'similarity_not_ready',
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    neighbors = index.lookup(webtoon_id)
+    webtoons = Webtoon.objects.filter(
+        id__in=[pk for pk, _ in neighbors], is_adult=False,
+    ).in_bulk()
+    ranked = [(webtoons[pk], score) for pk, score in neighbors if pk in webtoons][:limit]
+
+    serializer = WebtoonSerializer([w for w, _ in ranked], many=True, context={'request': request})
+    results = serializer.data
+    for item, (_, score) in zip(results, ranked):
+        item['score'] = round(score, 4)
+    return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def similar_webtoons(request, webtoon_id):
+    """장르가 비슷한 웹툰 (build_similarity 로 미리 계산한 결과)"""
+    return _neighbor_response(request, webtoon_id, GENRE_SIMILARITY)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def similar_story_webtoons(request, webtoon_id):
+    """줄거리가 비슷한 웹툰 (build_synopsis_similarity 로 미리 계산한 결과)"""
+    return _neighbor_response(request, webtoon_id, SYNOPSIS_SIMILARITY)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def author_lookup(request):
+    """작가 이름 검색 (정확히 일치 또는 이름 접두어, name unique 인덱스 범위 조회)"""
+    name = ' '.join(request.GET.get('name', '').split())
+    if not name:
+        return Response({'error': 'name 을 입력해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = _positive_int(request.GET, 'limit', 20, 100)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build(version):
+        authors = Author.objects.filter(
+            name__gte=name, name__lt=name + '\uffff',
+        ).annotate(
+            webtoon_count=Count('credits__webtoon', distinct=True),
+        ).order_by('name')[:limit]
+        results = [
+            {'id': a.id, 'name': a.name, 'webtoon_count': a.webtoon_count}
+            for a in authors
+        ]
+        # 정확히 일치하는 이름을 맨 앞으로
+        results.sort(key=lambda a: a['name'] != name)
+        return {'results': results}
+
+    data = cached_catalog_response('author_lookup', {'name': name, 'limit': limit}, build)
+    return Response(data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def author_webtoons(request, author_id):
+    """작가의 웹툰 목록 (역할 포함, (author, webtoon) 인덱스로 조회)"""
+    try:
+        page_num = _positive_int(request.GET, 'page', 1)
+        per_page = _positive_int(request.GET, 'per_page', 100, 100)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    def build(version):
+        author = Author.objects.filter(id=author_id).first()
+        if author is None:
+            return {}
+
+        roles = {}
+        for webtoon_id, role in WebtoonAuthor.objects.filter(author=author).values_list('webtoon_id', 'role'):
+            roles.setdefault(webtoon_id, []).append(role)
+        webtoons = Webtoon.objects.filter(id__in=list(roles), is_adult=False).order_by('-id')
+
+        paginator = Paginator(webtoons, per_page)
+        page_obj = paginator.get_page(page_num)
+        results = WebtoonSerializer(page_obj, many=True, context={'request': request, 'favorite_ids': set()}).data
+        for item in results:
+            item['roles'] = sorted(roles[item['id']])
+        return {
+            'author': {'id': author.id, 'name': author.name},
+            'count': paginator.count,
+            'total_pages': paginator.num_pages,
+            'current_page': page_num,
+            'results': results,
+        }
+
+    params = {'id': author_id, 'page': page_num, 'per_page': per_page}
+    data = cached_catalog_response('author_webtoons', params, build)
+    if not data:
+        return Response({'error': '작가를 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+    apply_favorites(data['results'], request)
+    return Response(data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
@@ -147,18 +502,63 @@ def toggle_favorite(request, webtoon_id):
     except Webtoon.DoesNotExist:
         return Response({'error': '웹툰을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
     
-    if webtoon.favorited_by.filter(id=request.user.id).exists():
-        webtoon.favorited_by.remove(request.user)
-        is_favorited = False
-        message = '즐겨찾기 해제'
-    else:
-        webtoon.favorited_by.add(request.user)
-        is_favorited = True
-        message = '즐겨찾기 추가'
+    is_favorited = favorite_service.toggle_favorite(request.user, webtoon)
+    message = '즐겨찾기 추가' if is_favorited else '즐겨찾기 해제'
+    webtoon.refresh_from_db(fields=['favorites_count'])
     
     return Response({
         'message': message,
         'is_favorited': is_favorited,
+        'favorites_count': webtoon.favorites_count,
+    }, status=status.HTTP_200_OK)
+
+
+FAVORITES_BATCH_MAX = 500  # 배치 요청 한 번에 받는 최대 id 수
+
+
+def _parse_ids(values):
+    """정수 id 목록으로. 잘못된 값이면 ValueError"""
+    if isinstance(values, str):
+        values = [v for v in values.split(',') if v.strip()]
+    if not isinstance(values, (list, tuple)):
+        raise ValueError
+    return [int(v) for v in values]
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def favorites_batch(request):
+    """즐겨찾기 여러 개를 한 번에 조회(GET ?ids=1,2,3) / 추가·해제(POST {"add": [...], "remove": [...]})"""
+    try:
+        if request.method == 'GET':
+            ids = _parse_ids(request.GET.get('ids', ''))
+            add = remove = []
+        else:
+            ids = []
+            add = _parse_ids(request.data.get('add', []))
+            remove = _parse_ids(request.data.get('remove', []))
+    except (TypeError, ValueError, AttributeError):
+        return Response({'error': 'id 는 정수 목록이어야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if len(ids) + len(add) + len(remove) > FAVORITES_BATCH_MAX:
+        return Response({'error': f'한 번에 {FAVORITES_BATCH_MAX}개까지만 가능합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if request.method == 'GET':
+        favorite_ids = favorite_service.favorite_states(request.user, ids)
+        return Response({
+            'favorites': {str(pk): pk in favorite_ids for pk in ids},
+            'favorites_version': request.user.favorites_version,
+        }, status=status.HTTP_200_OK)
+
+    if set(add) & set(remove):
+        return Response({'error': '같은 id 를 add 와 remove 에 함께 넣을 수 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    added, removed, missing = favorite_service.apply_favorites_batch(request.user, add, remove)
+    return Response({
+        'added': added,
+        'removed': removed,
+        'missing': missing,
+        'favorites_version': request.user.favorites_version,
     }, status=status.HTTP_200_OK)
 
 
@@ -167,7 +567,12 @@ def toggle_favorite(request, webtoon_id):
 def my_favorites(request):
     """내 즐겨찾기 목록"""
     provider = request.GET.get('provider')
-    q = request.GET.get('q', '')
+    q = ' '.join(request.GET.get('q', '').split())
+
+    etag = catalog_etag(request, 'my_favorites', {'provider': provider, 'q': q}, get_catalog_version())
+    response = not_modified(request, etag)
+    if response:
+        return response
     
     favorites = request.user.favorite_webtoons.all()
     
@@ -177,9 +582,59 @@ def my_favorites(request):
     
     # 검색
     if q:
-        favorites = favorites.filter(
-            Q(title__icontains=q) | Q(authors__icontains=q)
-        )
+        favorites = search_webtoons(favorites, q)
     
-    serializer = WebtoonSerializer(favorites, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # 내 즐겨찾기 목록이므로 모두 is_favorited=True (추가 조회 없음)
+    favorites = list(favorites)
+    serializer = WebtoonSerializer(favorites, many=True, context={
+        'request': request,
+        'favorite_ids': {w.id for w in favorites},
+    })
+    response = Response(serializer.data, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_recent(request):
+    """최근 본 웹툰 (최근 순)"""
+    try:
+        limit = _positive_int(request.GET, 'limit', history_size(), history_size())
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    webtoons = recent_webtoons(request.user, limit)
+    results = WebtoonSerializer(webtoons, many=True, context={'request': request}).data
+    for item, webtoon in zip(results, webtoons):
+        item['viewed_at'] = webtoon.viewed_at
+    return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def my_recommendations(request):
+    """즐겨찾기 기반 추천 웹툰"""
+    try:
+        limit = _positive_int(request.GET, 'limit', DEFAULT_LIMIT, MAX_LIMIT)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    recommended = recommend_for(request.user, limit)
+    if recommended is None:
+        return Response({
+            'error': '추천 정보를 준비 중입니다.',
+            'code': 'similarity_not_ready',
+        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    webtoons = Webtoon.objects.in_bulk([pk for pk, _ in recommended])
+    ranked = [(webtoons[pk], score) for pk, score in recommended if pk in webtoons]
+
+    # 추천 목록에는 즐겨찾기한 웹툰이 없으므로 is_favorited 는 모두 False
+    serializer = WebtoonSerializer([w for w, _ in ranked], many=True, context={
+        'request': request,
+        'favorite_ids': set(),
+    })
+    results = serializer.data
+    for item, (_, score) in zip(results, ranked):
+        item['score'] = round(score, 4)
+    return Response({'results': results}, status=status.HTTP_200_OK)
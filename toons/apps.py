@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _install_search_index(sender, using, **kwargs):
+    from .search import install_search_index
+    install_search_index(using)
 
 
 class ToonsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'toons'
+
+    def ready(self):
+        post_migrate.connect(_install_search_index, sender=self)
@@ -0,0 +1,154 @@
+"""미리 계산한 top-k 이웃 결과 저장/조회
+
+artifact 하나는 WEBTOON_ARTIFACT_DIR/<name> 심볼릭 링크가 가리키는 버전 디렉터리
+(WEBTOON_ARTIFACT_DIR/.<name>-xxxx/)이며 다음 파일로 이루어진다.
+
+    ids.npy        (n,)   int64   행 번호 → 웹툰 id (오름차순)
+    neighbors.npy  (n, k) int64   이웃 웹툰 id (-1 은 빈 칸)
+    scores.npy     (n, k) float32 유사도 점수 (내림차순)
+    meta.json             k, 카탈로그 버전, 생성 시각 등
+    <extra>.npy           그 외 함께 저장한 배열 (예: 장르 행렬)
+
+웹 프로세스는 np.load(mmap_mode='r') 로 읽으므로 여러 워커가 같은 페이지 캐시를
+공유하고, 조회는 searchsorted 한 번 + k 개 슬라이스로 끝난다.
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+
+def artifact_path(name):
+    return Path(settings.WEBTOON_ARTIFACT_DIR) / name
+
+
+def _current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _publish(target, version):
+    """target 심볼릭 링크를 version 디렉터리로 원자적으로 바꾼다. 이전에 가리키던 디렉터리 경로를 돌려준다"""
+    previous = None
+    if target.is_symlink():
+        previous = target.resolve()
+    elif target.is_dir():
+        # 링크 방식 이전에 실제 디렉터리로 저장된 artifact — 한 번만 옆으로 치운다
+        previous = target.with_name(f'.{target.name}-legacy-{os.getpid()}')
+        target.rename(previous)
+
+    link = target.with_name(f'.{target.name}-link-{os.getpid()}')
+    if link.is_symlink():
+        link.unlink()
+    os.symlink(version.name, link)
+    os.replace(link, target)
+    return previous
+
+
+def save_neighbors(name, ids, neighbors, scores, arrays=None, **meta):
+    """버전 디렉터리에 모두 쓴 뒤 <name> 심볼릭 링크를 바꿔 공개한다
+
+    링크 교체(rename)는 원자적이라 읽는 쪽은 항상 이전 버전이나 새 버전 중 하나를 온전히 본다.
+    바로 이전 버전은 이미 열어 둔 워커를 위해 남기고, 그보다 오래된 버전만 지운다.
+    """
+    target = artifact_path(name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    version = Path(tempfile.mkdtemp(prefix=f'.{name}-', dir=target.parent))
+    # mkdtemp 는 0700 으로 만든다 — 다른 사용자로 도는 웹 프로세스도 읽을 수 있게 umask 를 따른다
+    version.chmod(0o777 & ~_current_umask())
+
+    np.save(version / 'ids.npy', np.asarray(ids, dtype=np.int64))
+    np.save(version / 'neighbors.npy', np.asarray(neighbors, dtype=np.int64))
+    np.save(version / 'scores.npy', np.asarray(scores, dtype=np.float32))
+    for array_name, array in (arrays or {}).items():
+        np.save(version / f'{array_name}.npy', np.asarray(array))
+    meta = {
+        'k': int(np.asarray(neighbors).shape[1]) if len(ids) else 0,
+        'size': int(len(ids)),
+        'built_at': time.time(),
+        **meta,
+    }
+    (version / 'meta.json').write_text(json.dumps(meta))
+
+    previous = _publish(target, version)
+    keep = {version.name, previous.name if previous else None}
+    for stale in target.parent.glob(f'.{name}-*'):
+        if stale.name not in keep and stale.is_dir() and not stale.is_symlink():
+            shutil.rmtree(stale, ignore_errors=True)
+    if previous is not None and previous.name.startswith(f'.{name}-legacy-'):
+        shutil.rmtree(previous, ignore_errors=True)
+    return target
+
+
+class NeighborIndex:
+    """memory-map 한 top-k 이웃 artifact (버전 디렉터리 하나)"""
+
+    def __init__(self, path):
+        self.path = Path(path).resolve()
+        self.meta = json.loads((self.path / 'meta.json').read_text())
+        self.ids = np.load(self.path / 'ids.npy', mmap_mode='r')
+        self.neighbors = np.load(self.path / 'neighbors.npy', mmap_mode='r')
+        self.scores = np.load(self.path / 'scores.npy', mmap_mode='r')
+        self.built_at = self.meta['built_at']
+        self._arrays = {}
+
+    def array(self, name):
+        """함께 저장한 배열을 memory-map 으로 연다 (없으면 None)"""
+        if name not in self._arrays:
+            path = self.path / f'{name}.npy'
+            self._arrays[name] = np.load(path, mmap_mode='r') if path.exists() else None
+        return self._arrays[name]
+
+    def rows_of(self, webtoon_ids):
+        """웹툰 id 목록 → 행 번호 배열 (색인에 없는 id 는 빠진다)"""
+        webtoon_ids = np.asarray(webtoon_ids, dtype=np.int64)
+        rows = np.searchsorted(self.ids, webtoon_ids)
+        rows = np.clip(rows, 0, max(len(self.ids) - 1, 0))
+        if not len(self.ids):
+            return rows[:0]
+        return rows[self.ids[rows] == webtoon_ids]
+
+    def lookup(self, webtoon_id, limit=None):
+        """[(이웃 id, 점수), ...] 점수 내림차순. 색인에 없는 웹툰이면 빈 목록"""
+        row = int(np.searchsorted(self.ids, webtoon_id))
+        if row >= len(self.ids) or self.ids[row] != webtoon_id:
+            return []
+        neighbors = self.neighbors[row, :limit]
+        scores = self.scores[row, :limit]
+        return [
+            (int(n), float(s))
+            for n, s in zip(neighbors, scores)
+            if n >= 0
+        ]
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def load_neighbors(name):
+    """프로세스 내에서 한 번만 열고, 링크가 새 버전을 가리키면 새로 연다.
+
+    artifact 가 없으면 None.
+    """
+    # 링크를 풀어 둔 경로가 곧 버전이다 — 옛 실제 디렉터리면 meta.json 수정 시각으로 구분
+    version = artifact_path(name).resolve()
+    try:
+        key = (version, (version / 'meta.json').stat().st_mtime)
+    except FileNotFoundError:
+        return None
+
+    cached = _indexes.get(name)
+    if cached and cached[0] == key:
+        return cached[1]
+    with _lock:
+        index = NeighborIndex(version)
+        _indexes[name] = (key, index)
+    return index
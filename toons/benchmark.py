@@ -0,0 +1,255 @@
+"""API 벤치마크 (manage.py benchmark_api)
+
+임시 SQLite DB 에 카탈로그와 사용자/즐겨찾기를 만들어 넣고, 주요 엔드포인트를 여러 번 호출해
+지연 시간 백분위수와 쿼리 수를 잰다. 결과는 JSON 이라 커밋끼리 diff 해서 비교할 수 있다.
+
+카탈로그는 fixtures/webtoons.json (예전 필드 authors/is_end 형식) 또는
+CSV 행을 늘려서 만든 합성 카탈로그(--rows) 중 하나를 쓴다. 같은 --seed 면 같은 데이터/요청 순서.
+"""
+import json
+import platform
+import random
+import sqlite3
+import subprocess
+import time
+from collections import Counter
+
+import django
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from .favorites import rebuild_popularity_counters
+from .importers import CatalogImporter
+from .models import Webtoon
+
+SCENARIOS = ['webtoon_list', 'search', 'webtoon_detail', 'toggle_favorite', 'my_favorites', 'my_page']
+PROVIDERS = ['NAVER', 'KAKAO', 'KAKAOPAGE']
+CSV_COLUMNS = [
+    'titleName', 'Url', 'thumbnailUrl', 'is_adult', 'Writer', 'Painter',
+    'Original', 'synopsis', 'genre', 'day', 'provider',
+]
+
+
+def load_fixture_rows(path):
+    """fixtures/webtoons.json → CSV 와 같은 컬럼의 행 목록
+
+    파일 끝이 잘려 있어도 온전한 객체까지만 읽는다.
+    """
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    decoder = json.JSONDecoder()
+    pos = text.index('[') + 1
+    rows = []
+    while True:
+        while pos < len(text) and text[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(text) or text[pos] == ']':
+            break
+        try:
+            obj, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            break
+        if obj.get('model') != 'toons.webtoon':
+            continue
+        fields = obj['fields']
+        authors = fields.get('authors') or fields.get('writers') or ''
+        rows.append({
+            'titleName': fields['title'],
+            'Url': fields['url'],
+            'thumbnailUrl': fields.get('thumbnail', ''),
+            'is_adult': fields.get('is_adult', False),
+            'Writer': authors,
+            'Painter': fields.get('painters', authors),
+            'Original': fields.get('original_author', ''),
+            'synopsis': fields.get('synopsis', ''),
+            'genre': '',
+            'day': fields.get('update_days', ''),
+            'provider': fields['provider'],
+        })
+    return rows
+
+
+def synthetic_rows(seed_rows, total, rng):
+    """seed 행을 돌려 쓰면서 제목/url 만 바꿔 total 행까지 늘린다"""
+    rows = list(seed_rows)
+    n = 0
+    while len(rows) < total:
+        n += 1
+        row = dict(rng.choice(seed_rows))
+        row['titleName'] = f"{row['titleName']} {n}"
+        row['Url'] = f"{row['Url']}{'&' if '?' in row['Url'] else '?'}bench={n}"
+        rows.append(row)
+    return rows[:total] if total else rows
+
+
+def load_catalog(rows, chunk_size=1000):
+    importer = CatalogImporter()
+    df = pd.DataFrame(rows, columns=CSV_COLUMNS)
+    for start in range(0, len(df), chunk_size):
+        importer.import_chunk(df.iloc[start:start + chunk_size])
+    return importer.finish()
+
+
+def create_users(count, webtoon_ids, rng, zipf=1.1, mean_favorites=20):
+    """인기 작품에 몰리는(Zipf) 즐겨찾기 분포로 사용자와 즐겨찾기를 만든다"""
+    User = get_user_model()
+    users = User.objects.bulk_create([
+        User(
+            username=f'bench{i}', email=f'bench{i}@example.com',
+            gender=rng.choice(['M', 'F', None]),
+        )
+        for i in range(count)
+    ])
+
+    weights = [1 / (rank + 1) ** zipf for rank in range(len(webtoon_ids))]
+    Through = Webtoon.favorited_by.through
+    user_field = Webtoon._meta.get_field('favorited_by').m2m_reverse_field_name()
+    links = []
+    for user in users:
+        # 사용자마다 즐겨찾기 수도 한쪽으로 치우치게 (대부분 적고 일부가 많음)
+        k = min(len(webtoon_ids), max(1, int(rng.expovariate(1 / mean_favorites))))
+        for webtoon_id in set(rng.choices(webtoon_ids, weights=weights, k=k)):
+            links.append(Through(webtoon_id=webtoon_id, **{f'{user_field}_id': user.id}))
+    Through.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+    rebuild_popularity_counters()
+    return users, len(links)
+
+
+def percentile(sorted_values, p):
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    latencies = sorted(ms for ms, _, _ in samples)
+    queries = [q for _, q, _ in samples]
+    return {
+        'requests': len(samples),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p90_ms': round(percentile(latencies, 90), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'queries_mean': round(sum(queries) / len(queries), 2),
+        'queries_max': max(queries),
+        'status': dict(Counter(str(code) for _, _, code in samples)),
+    }
+
+
+class Runner:
+    def __init__(self, users, webtoon_ids, search_terms, rng, warm_cache=False):
+        self.users = users
+        self.webtoon_ids = webtoon_ids
+        self.search_terms = search_terms
+        self.rng = rng
+        self.warm_cache = warm_cache
+        self.anonymous = Client(HTTP_HOST='localhost')
+        self.clients = {}
+
+    def client_for(self, user):
+        if user.pk not in self.clients:
+            client = Client(HTTP_HOST='localhost')
+            client.force_login(user)
+            self.clients[user.pk] = client
+        return self.clients[user.pk]
+
+    def request(self, scenario):
+        """시나리오 하나의 (client, method, path, params)"""
+        rng = self.rng
+        user = rng.choice(self.users)
+        if scenario == 'webtoon_list':
+            params = {'provider': rng.choice(PROVIDERS), 'page': rng.randint(1, 5)}
+            return self.anonymous, 'get', '/api/webtoons/', params
+        if scenario == 'search':
+            params = {'provider': rng.choice(PROVIDERS), 'q': rng.choice(self.search_terms)}
+            return self.anonymous, 'get', '/api/webtoons/', params
+        if scenario == 'webtoon_detail':
+            return self.anonymous, 'get', f'/api/webtoons/{rng.choice(self.webtoon_ids)}/', {}
+        if scenario == 'toggle_favorite':
+            return self.client_for(user), 'post', f'/api/webtoons/{rng.choice(self.webtoon_ids)}/favorite/', {}
+        if scenario == 'my_favorites':
+            return self.client_for(user), 'get', '/api/me/favorites/', {}
+        if scenario == 'my_page':
+            return self.client_for(user), 'get', '/toons/mypage/', {}
+        raise ValueError(scenario)
+
+    def run(self, scenario, count, warmup=5):
+        samples = []
+        for i in range(warmup + count):
+            client, method, path, params = self.request(scenario)
+            # 기본은 캐시를 비우고 DB 경로를 잰다 (--warm-cache 면 캐시 적중 포함)
+            if not self.warm_cache:
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = getattr(client, method)(path, params)
+                elapsed = (time.perf_counter() - started) * 1000
+            if i >= warmup:
+                samples.append((elapsed, len(queries), response.status_code))
+        return summarize(samples)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(rows, users=50, requests=200, scenarios=SCENARIOS, seed=0, warm_cache=False, log=None):
+    """현재 DB(호출하는 쪽에서 임시 DB 로 바꿔 둔 상태)에 데이터를 넣고 벤치마크 결과 dict 를 돌려준다"""
+    log = log or (lambda message: None)
+    rng = random.Random(seed)
+
+    started = time.perf_counter()
+    stats = load_catalog(rows)
+    import_seconds = time.perf_counter() - started
+    log(f'카탈로그 적재: {stats.created}행 / {import_seconds:.2f}s')
+
+    # 인기 순서는 id 를 섞어서 정한다 (id 순서와 인기가 겹치지 않게)
+    webtoon_ids = list(Webtoon.objects.filter(is_adult=False).values_list('id', flat=True))
+    rng.shuffle(webtoon_ids)
+    started = time.perf_counter()
+    user_objs, favorites = create_users(users, webtoon_ids, rng)
+    log(f'사용자 {len(user_objs)}명 / 즐겨찾기 {favorites}건 / {time.perf_counter() - started:.2f}s')
+
+    titles = Webtoon.objects.values_list('title', flat=True)[:2000]
+    search_terms = sorted({word for title in titles for word in title.split() if len(word) >= 2})
+    runner = Runner(user_objs, webtoon_ids, search_terms or ['웹툰'], rng, warm_cache=warm_cache)
+
+    results = {}
+    for scenario in scenarios:
+        results[scenario] = runner.run(scenario, requests)
+        log(f"{scenario}: p50 {results[scenario]['p50_ms']}ms / p99 {results[scenario]['p99_ms']}ms "
+            f"/ 쿼리 {results[scenario]['queries_mean']}")
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'seed': seed,
+            'webtoons': stats.created,
+            'users': len(user_objs),
+            'favorites': favorites,
+            'requests_per_scenario': requests,
+            'warm_cache': warm_cache,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'sqlite': sqlite3.sqlite_version,
+        },
+        'setup': {
+            'import_seconds': round(import_seconds, 3),
+            'import_rows_per_second': round(stats.rows_per_second, 1),
+        },
+        'results': results,
+    }
@@ -0,0 +1,60 @@
+"""카탈로그 응답 캐시
+
+캐시 키 = 카탈로그 버전 + 엔드포인트 이름 + 정규화된 쿼리 파라미터.
+적재로 카탈로그 버전이 올라가면 예전 키는 더 이상 조회되지 않고 TTL 로 사라진다.
+
+캐시에는 비로그인 기준 응답만 저장하고, is_favorited 같은 사용자별 필드는
+꺼낸 뒤에 덧씌운다 (serializers.apply_favorites).
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from .catalog import get_catalog_version
+
+
+def response_cache_key(name, version, params):
+    raw = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'toons:v{version}:{name}:{digest}'
+
+
+def cached_catalog_response(name, params, build, version=None):
+    """캐시에 있으면 꺼내고, 없으면 build(version) 결과를 저장하고 돌려준다"""
+    if version is None:
+        version = get_catalog_version()
+    key = response_cache_key(name, version, params)
+    data = cache.get(key)
+    if data is None:
+        data = build(version)
+        cache.set(key, data, settings.WEBTOON_RESPONSE_CACHE_TIMEOUT)
+    return data
+
+
+def catalog_etag(request, name, params, version):
+    """카탈로그 버전 + 사용자 즐겨찾기 버전으로 만든 strong ETag"""
+    user = request.user
+    if user.is_authenticated:
+        viewer = f'{user.pk}:{user.favorites_version}'
+    else:
+        viewer = 'anon'
+    raw = json.dumps([name, version, viewer, params], sort_keys=True, ensure_ascii=False)
+    return '"{}"'.format(hashlib.md5(raw.encode()).hexdigest())
+
+
+def not_modified(request, etag):
+    """If-None-Match 가 현재 ETag 와 같으면 304 응답을, 아니면 None 을 돌려준다"""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return None
+    etags = parse_etags(header)
+    if etag in etags or '*' in etags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+    return None
@@ -0,0 +1,49 @@
+"""카탈로그 상태 확인
+
+요청 처리 경로에서는 절대 적재를 하지 않는다.
+적재는 `manage.py warm_catalog` / `import_webtoons` 로 미리 해 둔다.
+"""
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Webtoon, CatalogState
+
+CATALOG_RETRY_AFTER = 30  # seconds
+ALL_PROVIDERS = 'ALL'  # 목록 API 의 provider=ALL (플랫폼 전체)
+
+_ready = False
+
+
+def catalog_ready():
+    """카탈로그에 웹툰이 한 건이라도 있는지 (한 번 준비되면 프로세스 내에서 기억)"""
+    global _ready
+    if not _ready:
+        _ready = Webtoon.objects.exists()
+    return _ready
+
+
+def catalog_not_ready_response():
+    response = Response({
+        'error': '웹툰 목록을 준비 중입니다. 잠시 후 다시 시도해 주세요.',
+        'code': 'catalog_not_ready',
+    }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    response['Retry-After'] = str(CATALOG_RETRY_AFTER)
+    return response
+
+
+def get_catalog_version():
+    """현재 카탈로그 버전 (PK 조회 한 번)"""
+    version = CatalogState.objects.filter(pk=1).values_list('version', flat=True).first()
+    return version or 0
+
+
+def bump_catalog_version():
+    """웹툰 데이터가 바뀌었을 때 호출. 새 버전을 돌려준다."""
+    updated = CatalogState.objects.filter(pk=1).update(
+        version=F('version') + 1, updated_at=timezone.now(),
+    )
+    if not updated:
+        CatalogState.objects.get_or_create(pk=1, defaults={'version': 1})
+    return get_catalog_version()
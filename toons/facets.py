@@ -0,0 +1,140 @@
+"""목록 facet 필터와 facet 별 웹툰 수
+
+필터: genre(장르 태그), day(연재 요일), adult(성인 여부), author(작가 이름).
+facet 별 개수는 요청 때 GROUP BY 하지 않고, 적재가 끝날 때 바뀐 플랫폼만
+refresh_facets 로 다시 계산해 FacetCount 에 저장해 둔다.
+개수는 기본 목록(성인 웹툰 제외) 기준이며, adult facet 만 성인 웹툰을 포함해서 센다.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .catalog import ALL_PROVIDERS
+from .genres import genre_cluster, genre_labels
+from .models import Webtoon, WebtoonAuthor, FacetCount
+from .schedule import DAYS, DAY_BITS, masks_with, normalize_day
+
+FACETS = ['genre', 'day', 'adult', 'author']
+FACET_LIMIT = 30  # 응답에 facet 별로 넣을 최대 값 개수
+
+
+def split_names(text):
+    return [name.strip() for name in str(text or '').split(',') if name.strip()]
+
+
+def parse_facet_filters(params):
+    """쿼리 파라미터에서 facet 필터를 정규화해서 꺼낸다. 잘못된 값이면 ValueError"""
+    filters = {}
+
+    # 원본 태그("회귀물", "THRILL")로 와도 장르 묶음 이름으로 바꿔서 찾는다
+    labels = genre_labels()
+    genres = sorted({g if g in labels else genre_cluster(g) or g for g in split_names(params.get('genre'))})
+    if genres:
+        filters['genre'] = genres
+
+    days = []
+    for token in split_names(params.get('day')):
+        day = normalize_day(token)
+        if day is None:
+            raise ValueError(f"day 는 {', '.join(DAYS)} 중 하나여야 합니다.")
+        days.append(day)
+    if days:
+        filters['day'] = sorted(set(days), key=DAYS.index)
+
+    adult = params.get('adult', '0')
+    if adult not in ('0', '1', 'all'):
+        raise ValueError('adult 는 0, 1, all 중 하나여야 합니다.')
+    filters['adult'] = adult
+
+    author = params.get('author', '').strip()
+    if author:
+        filters['author'] = author
+    return filters
+
+
+def apply_facet_filters(queryset, filters):
+    """facet 안에서는 OR (장르 여러 개면 그중 하나), facet 끼리는 AND"""
+    if filters.get('adult', '0') == '0':
+        queryset = queryset.filter(is_adult=False)
+    elif filters['adult'] == '1':
+        queryset = queryset.filter(is_adult=True)
+
+    if 'genre' in filters:
+        Through = Webtoon.genres.through
+        queryset = queryset.filter(id__in=Through.objects.filter(
+            genre__tag__in=filters['genre'],
+        ).values('webtoon_id'))
+
+    if 'day' in filters:
+        masks = set()
+        for day in filters['day']:
+            masks.update(masks_with(day))
+        queryset = queryset.filter(update_days_mask__in=sorted(masks))
+
+    if 'author' in filters:
+        # 작가 이름 unique 인덱스 → (author, webtoon) 인덱스 (부분 문자열 일치 아님)
+        queryset = queryset.filter(id__in=WebtoonAuthor.objects.filter(
+            author__name=filters['author'],
+        ).values('webtoon_id'))
+    return queryset
+
+
+def compute_facets(provider):
+    """플랫폼 하나의 facet 별 개수 {facet: Counter}"""
+    base = Webtoon.objects.filter(provider=provider)
+    visible = base.filter(is_adult=False)
+    facets = {facet: Counter() for facet in FACETS}
+
+    for row in visible.values('genres__tag').annotate(n=Count('id')).exclude(genres__tag=None):
+        facets['genre'][row['genres__tag']] = row['n']
+
+    for row in visible.values('update_days_mask').annotate(n=Count('id')):
+        for day in DAYS:
+            if row['update_days_mask'] & DAY_BITS[day]:
+                facets['day'][day] += row['n']
+
+    for row in base.values('is_adult').annotate(n=Count('id')):
+        facets['adult']['1' if row['is_adult'] else '0'] = row['n']
+
+    authors = visible.values('credits__author__name').annotate(n=Count('id', distinct=True))
+    for row in authors.exclude(credits__author__name=None):
+        facets['author'][row['credits__author__name']] = row['n']
+    return facets
+
+
+def refresh_facets(providers):
+    """바뀐 플랫폼의 FacetCount 만 다시 계산해서 교체"""
+    for provider in sorted(providers):
+        facets = compute_facets(provider)
+        rows = [
+            FacetCount(provider=provider, facet=facet, value=value, count=count)
+            for facet, counter in facets.items()
+            for value, count in counter.items()
+            if count
+        ]
+        with transaction.atomic():
+            FacetCount.objects.filter(provider=provider).delete()
+            FacetCount.objects.bulk_create(rows, batch_size=1000)
+
+
+def facet_counts(provider, limit=FACET_LIMIT):
+    """응답용 {facet: [{'value', 'count'}, ...]} (개수 내림차순, facet 별 limit 개)
+
+    facet 마다 (provider, facet, -count) 인덱스를 타는 작은 쿼리 하나씩.
+    """
+    result = {}
+    for facet in FACETS:
+        rows = FacetCount.objects.filter(facet=facet)
+        if provider == ALL_PROVIDERS:
+            # 플랫폼 전체: 플랫폼별 개수를 합친다 (작가 facet 은 같은 작품이 두 번 셀 수 있음)
+            rows = rows.values('value').annotate(count=Sum('count'))
+        else:
+            rows = rows.filter(provider=provider)
+        rows = rows.order_by('-count', 'value')
+        result[facet] = [
+            {'value': value, 'count': count}
+            for value, count in rows.values_list('value', 'count')[:limit]
+        ]
+    result['day'].sort(key=lambda item: DAYS.index(item['value']))
+    return result
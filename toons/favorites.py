@@ -0,0 +1,141 @@
+"""즐겨찾기 변경 공통 처리
+
+api_views / views 의 즐겨찾기 토글과 배치 추가/해제는 모두 여기를 거친다.
+관계 추가/삭제와 인기 카운터(전체/남/여) 갱신, 급상승 버킷, 사용자 즐겨찾기 버전 증가를
+한 트랜잭션에서 처리한다.
+"""
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+
+from .models import Webtoon
+from .trending import record_favorite_adds, record_favorite_removes
+
+# 성별 → 성별 인기 카운터 필드
+GENDER_COUNTERS = {
+    'M': 'favorites_male_count',
+    'F': 'favorites_female_count',
+}
+COUNTER_FIELDS = ['favorites_count', *GENDER_COUNTERS.values()]
+
+
+def bump_favorites_version(user):
+    """사용자의 즐겨찾기가 바뀌었음을 기록 (ETag / 사용자별 캐시 무효화)"""
+    get_user_model().objects.filter(pk=user.pk).update(favorites_version=F('favorites_version') + 1)
+    user.favorites_version += 1
+    return user.favorites_version
+
+
+def counter_updates(user, delta):
+    """Webtoon.objects.filter(...).update(**) 에 넘길 카운터 증감식"""
+    updates = {'favorites_count': F('favorites_count') + delta}
+    field = GENDER_COUNTERS.get(user.gender)
+    if field:
+        updates[field] = F(field) + delta
+    return updates
+
+
+def toggle_favorite(user, webtoon):
+    """즐겨찾기 토글. 추가되었으면 True, 해제되었으면 False
+
+    관계 테이블을 먼저 지워 보고(있었으면 해제), 없었으면 unique 제약에 기대서 넣는다.
+    동시에 들어온 같은 추가 요청은 IntegrityError 로 걸러서 카운터가 두 번 오르지 않게 한다.
+    """
+    Through, user_column = _through()
+    link = {user_column: user.id, 'webtoon_id': webtoon.pk}
+    with transaction.atomic():
+        added_at = Through.objects.filter(**link).values_list('created_at', flat=True).first()
+        deleted, _ = Through.objects.filter(**link).delete()
+        if deleted:
+            delta = -1
+            record_favorite_removes([(webtoon.pk, added_at)])
+        else:
+            try:
+                with transaction.atomic():
+                    Through.objects.create(**link)
+            except IntegrityError:
+                # 다른 요청이 먼저 추가함 → 이미 즐겨찾기 상태
+                return True
+            delta = 1
+            record_favorite_adds([webtoon.pk])
+        Webtoon.objects.filter(pk=webtoon.pk).update(**counter_updates(user, delta))
+        bump_favorites_version(user)
+    return delta > 0
+
+
+def _through():
+    Through = Webtoon.favorited_by.through
+    user_field = Webtoon._meta.get_field('favorited_by').m2m_reverse_field_name()
+    return Through, f'{user_field}_id'
+
+
+def favorite_states(user, ids):
+    """ids 중 즐겨찾기한 웹툰 id 집합 (관계 테이블 쿼리 1번)"""
+    Through, user_column = _through()
+    return set(
+        Through.objects.filter(**{user_column: user.id}, webtoon_id__in=ids).values_list('webtoon_id', flat=True)
+    )
+
+
+def apply_favorites_batch(user, add=(), remove=()):
+    """여러 웹툰을 한 트랜잭션에서 즐겨찾기 추가/해제한다.
+
+    이미 그 상태인 id 는 건너뛰고, 실제로 바뀐 웹툰만 카운터를 갱신한다.
+    (추가된 id, 해제된 id, 없는 웹툰 id) 를 돌려준다.
+    """
+    Through, user_column = _through()
+    add, remove = set(add), set(remove)
+    with transaction.atomic():
+        # 같은 사용자의 동시 배치 요청은 사용자 행 잠금으로 순서대로 처리 (SQLite 는 DB 잠금)
+        list(get_user_model().objects.select_for_update().filter(pk=user.pk).values_list('pk'))
+
+        known = set(Webtoon.objects.filter(id__in=add | remove).values_list('id', flat=True))
+        current = favorite_states(user, known)
+        to_add = sorted((add & known) - current)
+        to_remove = sorted((remove & known) & current)
+
+        if to_add:
+            Through.objects.bulk_create(
+                [Through(webtoon_id=pk, **{user_column: user.id}) for pk in to_add],
+                ignore_conflicts=True,
+            )
+            Webtoon.objects.filter(id__in=to_add).update(**counter_updates(user, 1))
+            record_favorite_adds(to_add)
+        if to_remove:
+            removing = Through.objects.filter(**{user_column: user.id}, webtoon_id__in=to_remove)
+            record_favorite_removes(list(removing.values_list('webtoon_id', 'created_at')))
+            removing.delete()
+            Webtoon.objects.filter(id__in=to_remove).update(**counter_updates(user, -1))
+        if to_add or to_remove:
+            bump_favorites_version(user)
+    return to_add, to_remove, sorted((add | remove) - known)
+
+
+def rebuild_popularity_counters(batch_size=1000):
+    """즐겨찾기 관계 테이블에서 인기 카운터를 처음부터 다시 계산. 바뀐 웹툰 수를 돌려준다."""
+    Through = Webtoon.favorited_by.through
+    user_field = Webtoon._meta.get_field('favorited_by').m2m_reverse_field_name()
+    counts = {
+        row['webtoon_id']: row
+        for row in Through.objects.values('webtoon_id').annotate(
+            favorites_count=Count('id'),
+            favorites_male_count=Count('id', filter=Q(**{f'{user_field}__gender': 'M'})),
+            favorites_female_count=Count('id', filter=Q(**{f'{user_field}__gender': 'F'})),
+        )
+    }
+
+    changed = []
+    for webtoon in Webtoon.objects.only('id', *COUNTER_FIELDS).iterator(chunk_size=batch_size):
+        row = counts.get(webtoon.id, {})
+        dirty = False
+        for field in COUNTER_FIELDS:
+            value = row.get(field, 0)
+            if getattr(webtoon, field) != value:
+                setattr(webtoon, field, value)
+                dirty = True
+        if dirty:
+            changed.append(webtoon)
+
+    with transaction.atomic():
+        Webtoon.objects.bulk_update(changed, COUNTER_FIELDS, batch_size=batch_size)
+    return len(changed)
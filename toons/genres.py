@@ -0,0 +1,100 @@
+"""원본 장르 태그 → 장르 묶음(클러스터) 정규화
+
+플랫폼마다 제각각인 장르 태그("2013 최강자전", "THRILL", "회귀물" ...)를
+crawling/final_40_grouped_genres.csv 의 40개 묶음으로 모은다.
+영문 태그는 tag_translation_cache.csv 로 한글 태그로 바꿔서 한 번 더 찾는다.
+CSV 와 표기만 다른 장르 태그는 TAG_ALIASES 로 CSV 쪽 태그에 붙인다.
+매핑을 바꾼 뒤에는 `manage.py normalize_genres` (warm_catalog 도 실행) 로 이미 적재된 태그를 다시 묶는다.
+성격/캐릭터 태그("능글", "소유욕")처럼 어느 묶음에도 맞지 않는 태그는 묶음 없이 RawGenre 에만
+남는다 — `manage.py unmapped_genres` 로 목록을 볼 수 있다.
+두 CSV 는 프로세스당 한 번만 읽어서 dict 로 들고 있는다.
+"""
+import csv
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+_CLUSTER_PREFIX = re.compile(r'^\d+_')
+_SPACES = re.compile(r'\s+')
+
+# 플랫폼 표기 → CSV 에 있는 같은 뜻의 원본 태그 (키는 _key 로 정규화한 값)
+TAG_ALIASES = {
+    '로판': '로맨스판타지',
+    '로맨틱코미디': '로맨스코미디',
+    '궁정로맨스': '궁중로맨스',
+    '무협/사극': '무협',
+    '복수극': '복수',
+    '격투기': '격투',
+    '격투가': '격투',
+    '음식&요리': '음식/요리',
+    '아카데미': '학원',
+    '원작소설': '소설원작',
+    '서양': '서양풍',
+    '미스테리': '미스터리',
+    '미스테리한': '미스터리',
+    '재벌남': '재벌',
+    '재벌녀': '재벌',
+    '귀족': '왕족/귀족',
+    '황제': '왕족/귀족',
+    '걸크러쉬': '걸크러시',
+    '사이다녀': '사이다',
+    '사이다남': '사이다',
+    '연상': '연상녀',
+    '연상의': '연상녀',
+    '연하': '연하남',
+    '감성적인': '감성',
+    '잔잔한': '잔잔물',
+}
+
+
+def cluster_label(cluster_name):
+    """'1_액션_무협' → '액션/무협' (앞 번호는 CSV 안에서도 오타가 있어서 버린다)"""
+    return _CLUSTER_PREFIX.sub('', cluster_name.strip()).replace('_', '/')
+
+
+def _key(tag):
+    return _SPACES.sub('', tag).lower()
+
+
+@lru_cache(maxsize=1)
+def load_genre_maps():
+    """(원본 태그 키 → 묶음 이름, 원본 태그 키 → 한글 태그)"""
+    with open(settings.WEBTOON_GENRE_CLUSTERS_CSV, encoding='utf-8-sig', newline='') as f:
+        clusters = {
+            _key(row['raw_genre']): cluster_label(row['cluster_name'])
+            for row in csv.DictReader(f)
+            if row['raw_genre'].strip() and row['cluster_name'].strip()
+        }
+    with open(settings.WEBTOON_TAG_TRANSLATION_CSV, encoding='utf-8-sig', newline='') as f:
+        translations = {
+            _key(row['raw_tag']): row['ko_tag'].strip()
+            for row in csv.DictReader(f)
+            if row['raw_tag'].strip() and row['ko_tag'].strip()
+        }
+    return clusters, translations
+
+
+def genre_labels():
+    """장르 묶음 이름 전체"""
+    clusters, _ = load_genre_maps()
+    return set(clusters.values())
+
+
+def genre_cluster(tag):
+    """원본 태그 하나의 묶음 이름. 못 찾으면 None"""
+    clusters, translations = load_genre_maps()
+    key = _key(tag)
+    candidates = [key]
+    if key in translations:
+        candidates.append(_key(translations[key]))
+    # '회귀물' / '회귀' 처럼 '물' 접미사만 다른 표기
+    for candidate in list(candidates):
+        candidates.append(candidate[:-1] if candidate.endswith('물') else candidate + '물')
+    candidates.extend(TAG_ALIASES[c] for c in list(candidates) if c in TAG_ALIASES)
+
+    for candidate in candidates:
+        if candidate in clusters:
+            return clusters[candidate]
+    return None
+
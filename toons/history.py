@@ -0,0 +1,155 @@
+"""최근 본 웹툰 기록
+
+상세 조회마다 DB 에 쓰면 SQLite 의 단일 writer 가 막히므로 조회 기록은 프로세스 메모리 버퍼에
+모았다가 WEBTOON_HISTORY_FLUSH_SIZE 개가 차거나 WEBTOON_HISTORY_FLUSH_SECONDS 가 지나면
+한 번에 upsert 한다 (사용자 + 웹툰당 한 행, viewed_at 만 갱신).
+기록 후 WEBTOON_HISTORY_SIZE 개를 넘긴 사용자만 골라서 오래된 행을 한꺼번에 지운다.
+
+읽을 때는 (user, -viewed_at) 인덱스 쿼리 한 번에 아직 버퍼에 있는 기록을 합친다.
+버퍼는 프로세스마다 따로라서, 다른 워커가 받은 조회는 flush 뒤에 보인다.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import ViewHistory, Webtoon
+
+logger = logging.getLogger(__name__)
+
+
+def history_size():
+    return getattr(settings, 'WEBTOON_HISTORY_SIZE', 50)
+
+
+class ViewBuffer:
+    def __init__(self, flush_size, flush_seconds):
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.pending = {}  # (user_id, webtoon_id) → viewed_at
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.timer = None
+
+    def record(self, user_id, webtoon_id, viewed_at=None):
+        with self.lock:
+            self.pending[(user_id, webtoon_id)] = viewed_at or timezone.now()
+            full = len(self.pending) >= self.flush_size
+            self._start_timer()
+        if full:
+            self.flush()
+
+    def pending_for(self, user_id):
+        """아직 DB 에 안 쓴 이 사용자의 기록 {webtoon_id: viewed_at}"""
+        with self.lock:
+            return {w: at for (u, w), at in self.pending.items() if u == user_id}
+
+    def flush(self):
+        """버퍼를 비우고 한 번에 기록. 기록한 행 수를 돌려준다"""
+        with self.flush_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            if not pending:
+                return 0
+            try:
+                write_views(pending)
+            except Exception:
+                # 기록 실패 시 새로 들어온 것보다 오래된 값은 덮어쓰지 않고 되돌려 놓는다
+                with self.lock:
+                    for key, viewed_at in pending.items():
+                        self.pending.setdefault(key, viewed_at)
+                logger.exception('view history flush failed (%d rows)', len(pending))
+                return 0
+            return len(pending)
+
+    def _start_timer(self):
+        if self.timer is None or not self.timer.is_alive():
+            self.timer = threading.Thread(target=self._flush_later, name='view-history-flush', daemon=True)
+            self.timer.start()
+
+    def _flush_later(self):
+        time.sleep(self.flush_seconds)
+        try:
+            self.flush()
+        finally:
+            # 이 스레드가 연 DB 연결 정리
+            connection.close()
+        with self.lock:
+            self.timer = None
+            if self.pending:
+                self._start_timer()
+
+
+def write_views(pending):
+    """{(user_id, webtoon_id): viewed_at} 를 upsert 하고 사용자당 history_size() 개만 남긴다"""
+    user_ids = {user_id for user_id, _ in pending}
+    # 버퍼에 있는 동안 지워진 웹툰/사용자는 건너뛴다
+    webtoon_ids = set(Webtoon.objects.filter(id__in={w for _, w in pending}).values_list('id', flat=True))
+    user_ids = set(get_user_model().objects.filter(id__in=user_ids).values_list('id', flat=True))
+    rows = [
+        ViewHistory(user_id=user_id, webtoon_id=webtoon_id, viewed_at=viewed_at)
+        for (user_id, webtoon_id), viewed_at in pending.items()
+        if user_id in user_ids and webtoon_id in webtoon_ids
+    ]
+    keep = history_size()
+    with transaction.atomic():
+        ViewHistory.objects.bulk_create(
+            rows, batch_size=500,
+            update_conflicts=True, unique_fields=['user', 'webtoon'], update_fields=['viewed_at'],
+        )
+        over = (
+            ViewHistory.objects.filter(user_id__in=user_ids)
+            .values('user_id').annotate(n=Count('id')).filter(n__gt=keep)
+            .values_list('user_id', flat=True)
+        )
+        stale = []
+        for user_id in over:
+            stale.extend(
+                ViewHistory.objects.filter(user_id=user_id)
+                .order_by('-viewed_at').values_list('id', flat=True)[keep:]
+            )
+        if stale:
+            ViewHistory.objects.filter(id__in=stale).delete()
+
+
+buffer = ViewBuffer(
+    flush_size=getattr(settings, 'WEBTOON_HISTORY_FLUSH_SIZE', 200),
+    flush_seconds=getattr(settings, 'WEBTOON_HISTORY_FLUSH_SECONDS', 5),
+)
+atexit.register(buffer.flush)
+
+
+def record_view(user, webtoon_id):
+    if user.is_authenticated:
+        buffer.record(user.pk, webtoon_id)
+
+
+def recent_webtoons(user, limit=None):
+    """최근 본 순서의 Webtoon 목록 (각 객체에 viewed_at 이 붙어 있음)"""
+    limit = min(limit or history_size(), history_size())
+    rows = (
+        ViewHistory.objects.filter(user=user).select_related('webtoon')
+        .order_by('-viewed_at')[:limit]
+    )
+    viewed = {row.webtoon_id: (row.viewed_at, row.webtoon) for row in rows}
+
+    pending = buffer.pending_for(user.pk)
+    loaded = Webtoon.objects.in_bulk([w for w in pending if w not in viewed]) if pending else {}
+    for webtoon_id, viewed_at in pending.items():
+        if webtoon_id in viewed:
+            if viewed_at > viewed[webtoon_id][0]:
+                viewed[webtoon_id] = (viewed_at, viewed[webtoon_id][1])
+        elif webtoon_id in loaded:
+            viewed[webtoon_id] = (viewed_at, loaded[webtoon_id])
+
+    result = []
+    for viewed_at, webtoon in sorted(viewed.values(), key=lambda item: item[0], reverse=True)[:limit]:
+        webtoon.viewed_at = viewed_at
+        result.append(webtoon)
+    return result
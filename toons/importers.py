@@ -0,0 +1,419 @@
+"""웹툰 카탈로그 CSV 대량 적재 엔진
+
+행 단위 get_or_create 대신 CSV를 청크 단위로 읽어서
+웹툰 / 장르 / 웹툰-장르 연결 테이블을 bulk_create로 한 번에 기록한다.
+청크 하나가 트랜잭션 하나다.
+장르는 genres.genre_cluster 로 묶음 단위로 정규화해서 연결하고, 원본 태그는 RawGenre 에 따로 남긴다.
+
+웹툰은 (provider, url) 로 식별하고, 내용 해시가 바뀐 행만 다시 쓴다.
+데이터를 쓴 청크는 카탈로그 버전을 올리고 그 값을 쓴 행의 revision 으로 남긴다.
+"""
+import hashlib
+import time
+
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from .catalog import bump_catalog_version
+from .facets import refresh_facets
+from .genres import genre_cluster
+from .models import Author, Webtoon, WebtoonAuthor, Genre, RawGenre, WebtoonTombstone
+from .schedule import days_to_mask
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# CSV 컬럼 → Webtoon 필드
+FIELD_COLUMNS = {
+    'title': 'titleName',
+    'writers': 'Writer',
+    'painters': 'Painter',
+    'original_author': 'Original',
+    'update_days': 'day',
+    'thumbnail': 'thumbnailUrl',
+    'is_adult': 'is_adult',
+    'synopsis': 'synopsis',
+}
+# 작가 문자열 필드 → WebtoonAuthor.role
+AUTHOR_ROLES = {
+    'writers': WebtoonAuthor.WRITER,
+    'painters': WebtoonAuthor.PAINTER,
+    'original_author': WebtoonAuthor.ORIGINAL,
+}
+UPDATE_FIELDS = [*FIELD_COLUMNS, 'update_days_mask', 'content_hash', 'revision', 'updated_at']
+
+
+class ImportStats:
+    """적재 결과 집계"""
+
+    def __init__(self):
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.removed = 0
+        self.genres_created = 0
+        self.chunks = 0
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        if not self.elapsed:
+            return 0.0
+        return self.rows / self.elapsed
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'removed': self.removed,
+            'genres_created': self.genres_created,
+            'chunks': self.chunks,
+            'elapsed': round(self.elapsed, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+
+def _as_bool(value):
+    # 청크에 빈 값이 섞이면 pandas가 bool 컬럼을 문자열로 읽는다
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', '1', 'y', 'yes')
+    return bool(value)
+
+
+def _split_tags(text):
+    return [g.strip() for g in str(text).split(',') if g.strip()]
+
+
+def row_values(row):
+    """CSV 행 → Webtoon 필드 값 dict"""
+    values = {field: getattr(row, column) for field, column in FIELD_COLUMNS.items()}
+    values['is_adult'] = _as_bool(values['is_adult'])
+    return values
+
+
+def content_hash(values, tags):
+    """필드 값과 장르 태그로 만든 내용 해시 (태그 순서는 무시)"""
+    parts = [str(values[field]) for field in FIELD_COLUMNS]
+    parts.append(','.join(sorted(set(tags))))
+    return hashlib.md5('\x1f'.join(parts).encode()).hexdigest()
+
+
+class CatalogImporter:
+    """CSV 청크를 받아 DB에 대량 기록한다.
+
+    (provider, url) → (id, 내용 해시), 장르명/작가명 → id 맵을 메모리에 들고 있으므로
+    청크마다 조회 쿼리는 새로 생긴 행/장르에 대해서만 나간다.
+    """
+
+    def __init__(self):
+        self.stats = ImportStats()
+        self.webtoons = {
+            (provider, url): (pk, digest)
+            for pk, provider, url, digest in Webtoon.objects.values_list('id', 'provider', 'url', 'content_hash')
+        }
+        self.genre_ids = dict(Genre.objects.values_list('tag', 'id'))
+        self.raw_genre_ids = dict(RawGenre.objects.values_list('tag', 'id'))
+        self.author_ids = dict(Author.objects.values_list('name', 'id'))
+        self.seen = set()
+        self.touched_providers = set()
+
+    def import_chunk(self, df):
+        df = df.fillna('')
+        rows = list(df.itertuples(index=False))
+
+        new_webtoons = []
+        changed_webtoons = []
+        tags_by_key = {}
+        for row in rows:
+            key = (row.provider, row.Url)
+            # 같은 청크/파일 안의 중복 행은 처음 것만 쓴다
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+
+            values = row_values(row)
+            tags = _split_tags(row.genre)
+            digest = content_hash(values, tags)
+            pk, old_digest = self.webtoons.get(key, (None, None))
+            if pk is not None and digest == old_digest:
+                continue
+
+            tags_by_key[key] = tags
+            webtoon = Webtoon(
+                id=pk, provider=row.provider, url=row.Url, content_hash=digest,
+                update_days_mask=days_to_mask(values['update_days']), **values,
+            )
+            (changed_webtoons if pk else new_webtoons).append(webtoon)
+
+        if new_webtoons or changed_webtoons:
+            with transaction.atomic():
+                # 응답 캐시 무효화 + 이번에 쓰는 행의 revision (같은 트랜잭션 안에서)
+                revision = bump_catalog_version()
+                self._create_webtoons(new_webtoons, revision)
+                self._update_webtoons(changed_webtoons, revision)
+                replace = [w.pk for w in changed_webtoons]
+                self._link_genres(tags_by_key, replace=replace)
+                self._link_authors(new_webtoons + changed_webtoons, replace=replace)
+            self.touched_providers.update(w.provider for w in new_webtoons + changed_webtoons)
+
+        self.stats.rows += len(rows)
+        self.stats.created += len(new_webtoons)
+        self.stats.updated += len(changed_webtoons)
+        self.stats.skipped += len(rows) - len(new_webtoons) - len(changed_webtoons)
+        self.stats.chunks += 1
+        self.stats.elapsed = time.perf_counter() - self.stats.started_at
+
+    def merge_chunk(self, records):
+        """필드 일부만 있는 레코드를 병합한다 (API 동기화용)
+
+        records 는 provider, url 과 FIELD_COLUMNS 필드 중 일부를 가진 dict 목록이다.
+        기존 웹툰은 레코드에 있는 필드만 바꾸고 장르/작가 연결은 건드리지 않는다.
+        새 웹툰은 record['defaults'] 와 빈 값으로 나머지 필드를 채운다 (update_or_create 와 같은 뜻).
+        """
+        records_by_key = {}
+        for record in records:
+            key = (record['provider'], record['url'])
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            records_by_key[key] = record
+
+        pks = [self.webtoons[key][0] for key in records_by_key if key in self.webtoons]
+        current = Webtoon.objects.in_bulk(pks)
+        tags = {}
+        for webtoon_id, tag in Webtoon.raw_genres.through.objects.filter(
+            webtoon_id__in=pks,
+        ).values_list('webtoon_id', 'rawgenre__tag'):
+            tags.setdefault(webtoon_id, []).append(tag)
+
+        new_webtoons = []
+        changed_webtoons = []
+        changed_fields = set()
+        for key, record in records_by_key.items():
+            values = {field: record[field] for field in FIELD_COLUMNS if field in record}
+            webtoon = current.get(self.webtoons.get(key, (None, None))[0])
+            if webtoon is None:
+                values = {
+                    **{field: '' for field in FIELD_COLUMNS}, 'is_adult': False,
+                    **record.get('defaults', {}), **values,
+                }
+                new_webtoons.append(Webtoon(
+                    provider=key[0], url=key[1], content_hash=content_hash(values, []),
+                    update_days_mask=days_to_mask(values['update_days']), **values,
+                ))
+                continue
+
+            fields = [field for field, value in values.items() if getattr(webtoon, field) != value]
+            if not fields:
+                continue
+            for field in fields:
+                setattr(webtoon, field, values[field])
+            if 'update_days' in fields:
+                webtoon.update_days_mask = days_to_mask(webtoon.update_days)
+                fields.append('update_days_mask')
+            # 다음 CSV 적재가 같은 내용이면 건너뛰도록 병합한 값 + 기존 태그로 해시를 다시 계산
+            webtoon.content_hash = content_hash(
+                {field: getattr(webtoon, field) for field in FIELD_COLUMNS}, tags.get(webtoon.pk, []),
+            )
+            changed_webtoons.append(webtoon)
+            changed_fields.update(fields)
+
+        if new_webtoons or changed_webtoons:
+            with transaction.atomic():
+                revision = bump_catalog_version()
+                self._create_webtoons(new_webtoons, revision)
+                self._update_webtoons(
+                    changed_webtoons, revision,
+                    fields=[*sorted(changed_fields), 'content_hash', 'revision', 'updated_at'],
+                )
+                self._link_authors(new_webtoons)
+            self.touched_providers.update(w.provider for w in new_webtoons + changed_webtoons)
+
+        self.stats.rows += len(records)
+        self.stats.created += len(new_webtoons)
+        self.stats.updated += len(changed_webtoons)
+        self.stats.skipped += len(records) - len(new_webtoons) - len(changed_webtoons)
+        self.stats.chunks += 1
+        self.stats.elapsed = time.perf_counter() - self.stats.started_at
+
+    def _create_webtoons(self, webtoons, revision):
+        if not webtoons:
+            return
+        for w in webtoons:
+            w.created_revision = w.revision = revision
+        created = Webtoon.objects.bulk_create(webtoons)
+        if all(w.pk is not None for w in created):
+            for w in created:
+                self.webtoons[(w.provider, w.url)] = (w.pk, w.content_hash)
+            return
+        # RETURNING을 지원하지 않는 DB(MySQL 등)는 url 기준으로 다시 읽는다
+        urls = [w.url for w in webtoons]
+        for pk, provider, url, digest in (
+            Webtoon.objects.filter(url__in=urls).values_list('id', 'provider', 'url', 'content_hash')
+        ):
+            self.webtoons[(provider, url)] = (pk, digest)
+        for w in webtoons:
+            w.pk = self.webtoons[(w.provider, w.url)][0]
+
+    def _update_webtoons(self, webtoons, revision, fields=UPDATE_FIELDS):
+        if not webtoons:
+            return
+        now = timezone.now()
+        for w in webtoons:
+            w.revision = revision
+            w.updated_at = now
+            self.webtoons[(w.provider, w.url)] = (w.pk, w.content_hash)
+        Webtoon.objects.bulk_update(webtoons, fields, batch_size=500)
+
+    def _link_genres(self, tags_by_key, replace=()):
+        raw_tags = {tag for tags in tags_by_key.values() for tag in tags}
+        labels = {tag: genre_cluster(tag) for tag in raw_tags}
+
+        missing = {label for label in labels.values() if label} - self.genre_ids.keys()
+        if missing:
+            Genre.objects.bulk_create([Genre(tag=label) for label in missing], ignore_conflicts=True)
+            # ignore_conflicts 로 빠진 행이 있을 수 있으니 실제로 다시 읽어 온 id 만 센다
+            created = dict(Genre.objects.filter(tag__in=missing).values_list('tag', 'id'))
+            self.genre_ids.update(created)
+            self.stats.genres_created += len(created)
+
+        missing = raw_tags - self.raw_genre_ids.keys()
+        if missing:
+            RawGenre.objects.bulk_create([
+                RawGenre(tag=tag, genre_id=self.genre_ids.get(labels[tag])) for tag in missing
+            ], ignore_conflicts=True)
+            self.raw_genre_ids.update(RawGenre.objects.filter(tag__in=missing).values_list('tag', 'id'))
+
+        Through = Webtoon.genres.through
+        RawThrough = Webtoon.raw_genres.through
+        if replace:
+            # 내용이 바뀐 웹툰은 장르 연결을 새로 만든다
+            Through.objects.filter(webtoon_id__in=replace).delete()
+            RawThrough.objects.filter(webtoon_id__in=replace).delete()
+        Through.objects.bulk_create([
+            Through(webtoon_id=self.webtoons[key][0], genre_id=self.genre_ids[label])
+            for key, tags in tags_by_key.items()
+            for label in {labels[tag] for tag in tags} - {None}
+        ], ignore_conflicts=True)
+        RawThrough.objects.bulk_create([
+            RawThrough(webtoon_id=self.webtoons[key][0], rawgenre_id=self.raw_genre_ids[tag])
+            for key, tags in tags_by_key.items()
+            for tag in set(tags)
+        ], ignore_conflicts=True)
+
+    def _link_authors(self, webtoons, replace=()):
+        credits = {
+            (w.pk, name[:255], role)
+            for w in webtoons
+            for field, role in AUTHOR_ROLES.items()
+            for name in _split_tags(getattr(w, field))
+        }
+        missing = {name for _, name, _ in credits} - self.author_ids.keys()
+        if missing:
+            Author.objects.bulk_create([Author(name=name) for name in missing], ignore_conflicts=True)
+            self.author_ids.update(Author.objects.filter(name__in=missing).values_list('name', 'id'))
+
+        if replace:
+            WebtoonAuthor.objects.filter(webtoon_id__in=replace).delete()
+        WebtoonAuthor.objects.bulk_create([
+            WebtoonAuthor(webtoon_id=pk, author_id=self.author_ids[name], role=role)
+            for pk, name, role in credits
+        ], ignore_conflicts=True)
+
+    def prune(self, providers):
+        """이번 적재에 없었던 웹툰을 지우고 tombstone 을 남긴다 (주어진 플랫폼만)"""
+        stale = [
+            pk for (provider, url), (pk, _) in self.webtoons.items()
+            if provider in providers and (provider, url) not in self.seen
+        ]
+        if stale:
+            remove_webtoons(stale)
+            self.touched_providers.update(providers)
+            for key in [k for k, (pk, _) in self.webtoons.items() if pk in set(stale)]:
+                del self.webtoons[key]
+        self.stats.removed += len(stale)
+        return len(stale)
+
+    def finish(self):
+        """적재가 끝난 뒤 바뀐 플랫폼의 파생 데이터(facet 개수)를 갱신"""
+        if self.touched_providers:
+            refresh_facets(self.touched_providers)
+            # facet 이 갱신되기 전 버전으로 캐시된 응답을 무효화
+            bump_catalog_version()
+            self.touched_providers = set()
+        self.stats.elapsed = time.perf_counter() - self.stats.started_at
+        return self.stats
+
+
+def remove_webtoons(ids):
+    """웹툰을 지우고 변경 피드용 tombstone 을 남긴다"""
+    with transaction.atomic():
+        revision = bump_catalog_version()
+        WebtoonTombstone.objects.bulk_create(
+            [WebtoonTombstone(webtoon_id=pk, revision=revision) for pk in ids]
+        )
+        Webtoon.objects.filter(id__in=ids).delete()
+    return revision
+
+
+def normalize_genres():
+    """원본 태그(RawGenre)를 지금의 genres 매핑으로 다시 묶고, 묶음이 바뀐 태그가 붙은 웹툰의 장르 연결과
+    facet 개수를 고친다. 매핑(CSV, TAG_ALIASES)이 바뀌면 다시 적재하지 않고 이것만 돌리면 된다.
+
+    묶음이 바뀐 원본 태그 수를 돌려준다.
+    """
+    raw = list(RawGenre.objects.values_list('id', 'tag', 'genre__tag'))
+    labels = {pk: genre_cluster(tag) for pk, tag, _ in raw}
+    changed = [pk for pk, _, current in raw if labels[pk] != current]
+    if not changed:
+        return 0
+
+    RawThrough = Webtoon.raw_genres.through
+    Through = Webtoon.genres.through
+    with transaction.atomic():
+        wanted = {labels[pk] for pk in changed} - {None}
+        Genre.objects.bulk_create([Genre(tag=label) for label in wanted], ignore_conflicts=True)
+        genre_ids = dict(Genre.objects.filter(tag__in=wanted).values_list('tag', 'id'))
+        by_label = {}
+        for pk in changed:
+            by_label.setdefault(labels[pk], []).append(pk)
+        for label, ids in by_label.items():
+            RawGenre.objects.filter(id__in=ids).update(genre_id=genre_ids.get(label))
+
+        # 바뀐 태그가 붙은 웹툰은 원본 태그 전체로 장르 연결을 다시 만든다
+        affected = set(RawThrough.objects.filter(rawgenre_id__in=changed).values_list('webtoon_id', flat=True))
+        Through.objects.filter(webtoon_id__in=affected).delete()
+        Through.objects.bulk_create([
+            Through(webtoon_id=webtoon_id, genre_id=genre_id)
+            for webtoon_id, genre_id in set(
+                RawThrough.objects.filter(webtoon_id__in=affected, rawgenre__genre__isnull=False)
+                .values_list('webtoon_id', 'rawgenre__genre_id')
+            )
+        ], ignore_conflicts=True, batch_size=1000)
+        providers = set(Webtoon.objects.filter(id__in=affected).values_list('provider', flat=True))
+
+    if providers:
+        refresh_facets(providers)
+    bump_catalog_version()
+    return len(changed)
+
+
+def import_webtoons_from_csv(csv_path, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, prune=False):
+    """CSV 파일을 청크 단위로 적재하고 ImportStats를 돌려준다.
+
+    prune=True 면 CSV에 나온 플랫폼에서 CSV에 없는 웹툰을 삭제한다.
+    """
+    importer = CatalogImporter()
+    providers = set()
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+        providers.update(chunk['provider'].dropna().unique())
+        importer.import_chunk(chunk)
+        if progress:
+            progress(importer.stats)
+    if prune:
+        importer.prune(providers)
+    return importer.finish()
@@ -0,0 +1,69 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from toons.benchmark import SCENARIOS, load_fixture_rows, run_benchmark, synthetic_rows
+
+
+class Command(BaseCommand):
+    help = '임시 DB 에 카탈로그/사용자를 만들고 주요 API 의 지연 시간과 쿼리 수를 JSON 으로 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fixture', default=str(settings.BASE_DIR / 'fixtures' / 'webtoons.json'))
+        parser.add_argument(
+            '--rows', type=int, default=0,
+            help='0 보다 크면 CSV 카탈로그 행을 늘려 만든 합성 카탈로그를 씁니다 (예: 100000).',
+        )
+        parser.add_argument('--csv-path', default=str(settings.WEBTOON_CATALOG_CSV))
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=200, help='시나리오별 요청 수')
+        parser.add_argument('--scenario', action='append', choices=SCENARIOS, help='여러 번 지정 가능 (기본: 전체)')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--warm-cache', action='store_true', help='요청 사이에 응답 캐시를 비우지 않습니다.')
+        parser.add_argument('--output', help='결과 JSON 파일 (기본: 표준 출력)')
+
+    def handle(self, *args, **options):
+        if options['rows'] > 0:
+            import pandas as pd
+            seed_rows = pd.read_csv(options['csv_path']).fillna('').to_dict('records')
+            rows = synthetic_rows(seed_rows, options['rows'], random.Random(options['seed']))
+        else:
+            rows = load_fixture_rows(options['fixture'])
+        if not rows:
+            raise CommandError('적재할 웹툰이 없습니다.')
+
+        # 실제 DB 는 건드리지 않고 테스트 DB 를 임시 파일로 만든다
+        old_name = connection.settings_dict['NAME']
+        tmpdir = tempfile.mkdtemp(prefix='webtoon-bench-')
+        if connection.vendor == 'sqlite':
+            connection.settings_dict['TEST']['NAME'] = os.path.join(tmpdir, 'bench.sqlite3')
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(ALLOWED_HOSTS=['localhost']):
+                result = run_benchmark(
+                    rows,
+                    users=options['users'],
+                    requests=options['requests'],
+                    scenarios=options['scenario'] or SCENARIOS,
+                    seed=options['seed'],
+                    warm_cache=options['warm_cache'],
+                    log=self.stderr.write,
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+        text = json.dumps(result, ensure_ascii=False, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+            self.stderr.write(self.style.SUCCESS(f"결과 저장: {options['output']}"))
+        else:
+            self.stdout.write(text)
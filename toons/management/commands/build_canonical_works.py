@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from toons.works import build_canonical_works
+
+
+class Command(BaseCommand):
+    help = '정규화한 제목 + 작가 이름으로 플랫폼 간 같은 작품을 묶어 canonical_work 를 계산합니다.'
+
+    def handle(self, *args, **options):
+        result = build_canonical_works()
+        self.stdout.write(self.style.SUCCESS(
+            f"작품 묶기 완료: 웹툰 {result['webtoons']} → 작품 {result['works']} "
+            f"(묶인 행 {result['merged']}, 변경 {result['changed']}) / {result['elapsed']:.2f}s"
+        ))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from toons.similarity import DEFAULT_BATCH_SIZE, DEFAULT_TOP_K, build_genre_similarity
+
+
+class Command(BaseCommand):
+    help = '장르 multi-hot 코사인 유사도로 웹툰별 유사 작품 top-k 를 미리 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-k', type=int, default=DEFAULT_TOP_K)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        result = build_genre_similarity(k=options['k'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"유사도 계산 완료: 웹툰 {result['webtoons']} / 장르 {result['genres']} / "
+            f"k={result['k']} / {result['elapsed']:.2f}s → {result['path']}"
+        ))
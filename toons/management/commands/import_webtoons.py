@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from toons.importers import DEFAULT_CHUNK_SIZE, import_webtoons_from_csv
+
+
+class Command(BaseCommand):
+    help = '크롤링한 웹툰 CSV를 DB에 대량 적재합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', nargs='?', default=str(settings.WEBTOON_CATALOG_CSV))
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--prune', action='store_true',
+            help='CSV에 나온 플랫폼에서 CSV에 없는 웹툰을 삭제합니다.',
+        )
+
+    def handle(self, *args, **options):
+        def progress(stats):
+            self.stdout.write(
+                f"  {stats.rows}행 처리 ({stats.rows_per_second:.0f} rows/s)"
+            )
+
+        stats = import_webtoons_from_csv(
+            options['csv_path'],
+            chunk_size=options['chunk_size'],
+            progress=progress if options['verbosity'] > 1 else None,
+            prune=options['prune'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"적재 완료: {stats.rows}행 / 신규 {stats.created} / 변경 {stats.updated} / "
+            f"그대로 {stats.skipped} / 삭제 {stats.removed} / "
+            f"신규 장르 {stats.genres_created} / {stats.elapsed:.2f}s "
+            f"({stats.rows_per_second:.0f} rows/s)"
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from toons.importers import normalize_genres
+
+
+class Command(BaseCommand):
+    help = '원본 장르 태그를 지금의 장르 묶음 매핑(CSV, genres.TAG_ALIASES)으로 다시 묶습니다.'
+
+    def handle(self, *args, **options):
+        changed = normalize_genres()
+        self.stdout.write(self.style.SUCCESS(f"장르 묶음 갱신 완료: 바뀐 원본 태그 {changed}개"))
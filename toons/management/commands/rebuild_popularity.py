@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from toons.favorites import rebuild_popularity_counters
+
+
+class Command(BaseCommand):
+    help = (
+        '즐겨찾기 관계에서 웹툰별 인기 카운터(전체/남/여)를 다시 계산합니다. '
+        '관계 테이블을 직접 건드리는 대량 작업 뒤에 카운터를 맞출 때 사용합니다.'
+    )
+
+    def handle(self, *args, **options):
+        changed = rebuild_popularity_counters()
+        self.stdout.write(self.style.SUCCESS(f"인기 카운터 재계산 완료: {changed}개 웹툰 갱신"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from toons.catalog import bump_catalog_version
+from toons.facets import refresh_facets
+from toons.models import Webtoon
+
+
+class Command(BaseCommand):
+    help = '플랫폼별 facet(장르/요일/성인/작가) 개수를 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('providers', nargs='*', help='기본값: DB에 있는 모든 플랫폼')
+
+    def handle(self, *args, **options):
+        providers = options['providers'] or list(
+            Webtoon.objects.values_list('provider', flat=True).distinct()
+        )
+        refresh_facets(providers)
+        # 예전 개수로 캐시된 목록 응답 / ETag 무효화
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f"facet 개수 갱신 완료: {', '.join(sorted(providers))}"))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from toons.sync import (
+    DEFAULT_CONCURRENCY, DEFAULT_MAX_PAGES, DEFAULT_RETRIES, PROVIDERS,
+    SyncError, sync_provider,
+)
+from toons.importers import CatalogImporter
+
+
+class Command(BaseCommand):
+    help = 'korea-webtoon-api 에서 플랫폼별 웹툰을 동시에 받아와 DB에 반영합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('providers', nargs='*', help=f"기본값: {' '.join(PROVIDERS)}")
+        parser.add_argument('--base-url', help='기본값: settings.WEBTOON_API_BASE (stub 서버 테스트용)')
+        parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+        parser.add_argument('--max-pages', type=int, default=DEFAULT_MAX_PAGES)
+        parser.add_argument('--timeout', type=float, help='기본값: settings.WEBTOON_API_TIMEOUT')
+        parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES)
+
+    def handle(self, *args, **options):
+        providers = options['providers'] or list(PROVIDERS)
+        unknown = set(providers) - set(PROVIDERS)
+        if unknown:
+            raise CommandError(f"알 수 없는 플랫폼: {', '.join(sorted(unknown))}")
+
+        importer = CatalogImporter()
+        failed = []
+        for provider in providers:
+            try:
+                stats = sync_provider(
+                    provider,
+                    base_url=options['base_url'],
+                    concurrency=options['concurrency'],
+                    max_pages=options['max_pages'],
+                    timeout=options['timeout'],
+                    retries=options['retries'],
+                    importer=importer,
+                )
+            except SyncError as e:
+                failed.append(provider)
+                self.stderr.write(self.style.ERROR(f"{provider} 동기화 실패: {e}"))
+                continue
+            self.stdout.write(self.style.SUCCESS(
+                f"{provider}: {stats.pages}페이지 / {stats.items}개 / 반영 {stats.saved} / "
+                f"재시도 {stats.retries} / {stats.elapsed:.2f}s "
+                f"({stats.pages_per_second:.1f} pages/s, {stats.items_per_second:.0f} items/s)"
+            ))
+        importer.finish()
+        if failed:
+            raise CommandError(f"동기화 실패: {', '.join(failed)}")
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from toons.models import RawGenre
+
+
+class Command(BaseCommand):
+    help = '장르 묶음에 들어가지 못한 원본 장르 태그를 웹툰 수와 함께 보여줍니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--provider', help='이 플랫폼 웹툰에 붙은 태그만')
+
+    def handle(self, *args, **options):
+        tags = RawGenre.objects.filter(genre=None)
+        if options['provider']:
+            tags = tags.filter(webtoons__provider=options['provider'])
+        tags = tags.annotate(n=Count('webtoons', distinct=True)).order_by('-n', 'tag')
+
+        for tag in tags:
+            self.stdout.write(f"  {tag.n:>6}  {tag.tag}")
+        total = RawGenre.objects.count()
+        self.stdout.write(self.style.WARNING(
+            f"묶음 없는 원본 태그 {len(tags)}개 / 전체 {total}개 "
+            f"(genres.TAG_ALIASES 또는 장르 묶음 CSV 에 추가한 뒤 normalize_genres)"
+        ))
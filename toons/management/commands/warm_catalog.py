@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from toons.importers import DEFAULT_CHUNK_SIZE, import_webtoons_from_csv, normalize_genres
+from toons.models import Webtoon
+from toons.works import build_canonical_works
+
+PROVIDERS = ['NAVER', 'KAKAO', 'KAKAOPAGE']
+
+
+class Command(BaseCommand):
+    help = '서비스 시작 전에 모든 플랫폼의 웹툰 카탈로그를 미리 적재합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--csv-path', default=str(settings.WEBTOON_CATALOG_CSV))
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--force', action='store_true',
+            help='이미 적재된 플랫폼이 있어도 CSV를 다시 적재합니다.',
+        )
+
+    def handle(self, *args, **options):
+        missing = [p for p in PROVIDERS if not Webtoon.objects.filter(provider=p).exists()]
+
+        if missing or options['force']:
+            if missing:
+                self.stdout.write(f"비어 있는 플랫폼: {', '.join(missing)}")
+            stats = import_webtoons_from_csv(options['csv_path'], chunk_size=options['chunk_size'])
+            self.stdout.write(
+                f"적재: {stats.rows}행 / 신규 {stats.created} / 변경 {stats.updated} / {stats.elapsed:.2f}s "
+                f"({stats.rows_per_second:.0f} rows/s)"
+            )
+        else:
+            self.stdout.write('모든 플랫폼이 이미 적재되어 있습니다.')
+
+        # 장르 묶음 매핑이 바뀌었거나 0009 마이그레이션 직후면 원본 태그를 다시 묶는다
+        changed = normalize_genres()
+        if changed:
+            self.stdout.write(f"장르 묶음 갱신: 원본 태그 {changed}개")
+
+        # 새로 들어온 행이 있으면 플랫폼 간 같은 작품 묶음을 다시 계산
+        if Webtoon.objects.filter(canonical_work=None).exists():
+            result = build_canonical_works()
+            self.stdout.write(f"작품 묶기: 작품 {result['works']} / 묶인 행 {result['merged']} / {result['elapsed']:.2f}s")
+
+        for provider in PROVIDERS:
+            count = Webtoon.objects.filter(provider=provider).count()
+            style = self.style.SUCCESS if count else self.style.WARNING
+            self.stdout.write(style(f"  {provider}: {count}"))
@@ -0,0 +1,194 @@
+"""엔드포인트별 지연 시간 / 쿼리 수 계측
+
+MetricsMiddleware 가 요청마다 전체 시간, DB 쿼리 수, DB 시간을 URL 이름(view_name) 별
+히스토그램에 누적하고 /api/metrics 에서 Prometheus 텍스트 형식으로 내보낸다.
+값은 프로세스 메모리에만 있으므로 워커마다 따로 수집된다 (Prometheus 에서 합산).
+
+/api/metrics 는 느린 SQL 샘플까지 담고 있으므로 기본으로는 staff 로그인에만 연다. Prometheus 가 긁게 하려면
+WEBTOON_METRICS_TOKEN 환경 변수에 토큰을 넣고 scrape 설정에 `authorization: {credentials: <token>}`
+(Bearer) 를 준다. 프록시를 거치지 않는 내부망이면 WEBTOON_METRICS_ALLOWED_IPS(쉼표 구분)로 IP 를 열 수도 있다.
+
+WEBTOON_SLOW_REQUEST_MS 를 넘거나 쿼리가 WEBTOON_SLOW_REQUEST_QUERIES 개를 넘는 요청은
+가장 오래 걸린 SQL 몇 개와 함께 toons.metrics 로거에 경고로 남긴다.
+"""
+import hmac
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)  # seconds
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLOW_SQL_SHOWN = 5
+SLOW_SQL_CHARS = 500
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, n in zip((*self.buckets, '+Inf'), self.counts):
+            cumulative += n
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_sum{{{labels}}} {self.sum:.6f}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+class Registry:
+    """(view, method) 별 히스토그램과 (view, method, status) 별 요청 수"""
+
+    HISTOGRAMS = {
+        'webtoon_http_request_duration_seconds': ('요청 처리 시간', DURATION_BUCKETS),
+        'webtoon_db_query_duration_seconds': ('요청당 DB 쿼리 시간 합', DURATION_BUCKETS),
+        'webtoon_db_queries_per_request': ('요청당 DB 쿼리 수', QUERY_BUCKETS),
+    }
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {name: {} for name in self.HISTOGRAMS}
+        self.requests = {}
+
+    def record(self, view, method, status, duration, db_time, queries):
+        key = (view, method)
+        with self.lock:
+            for name, value in (
+                ('webtoon_http_request_duration_seconds', duration),
+                ('webtoon_db_query_duration_seconds', db_time),
+                ('webtoon_db_queries_per_request', queries),
+            ):
+                series = self.histograms[name]
+                if key not in series:
+                    series[key] = Histogram(self.HISTOGRAMS[name][1])
+                series[key].observe(value)
+            counter_key = (view, method, status)
+            self.requests[counter_key] = self.requests.get(counter_key, 0) + 1
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        with self.lock:
+            lines = [
+                '# HELP webtoon_http_requests_total 처리한 요청 수',
+                '# TYPE webtoon_http_requests_total counter',
+            ]
+            for (view, method, status), n in sorted(self.requests.items()):
+                lines.append(
+                    f'webtoon_http_requests_total{{view="{view}",method="{method}",status="{status}"}} {n}'
+                )
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (view, method), histogram in sorted(self.histograms[name].items()):
+                    lines.extend(histogram.lines(name, f'view="{view}",method="{method}"'))
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+class QueryRecorder:
+    """connection.execute_wrapper 로 쿼리마다 (소요 시간, SQL) 을 모은다"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - started, sql))
+
+    @property
+    def db_time(self):
+        return sum(elapsed for elapsed, _ in self.queries)
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_seconds = getattr(settings, 'WEBTOON_SLOW_REQUEST_MS', 500) / 1000
+        self.slow_queries = getattr(settings, 'WEBTOON_SLOW_REQUEST_QUERIES', 50)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+
+        def finish():
+            duration = time.perf_counter() - started
+            registry.record(
+                view, request.method, response.status_code,
+                duration, recorder.db_time, len(recorder.queries),
+            )
+            if duration >= self.slow_seconds or len(recorder.queries) >= self.slow_queries:
+                self.log_slow_request(request, view, duration, recorder)
+
+        if response.streaming and not getattr(response, 'is_async', False):
+            # 스트리밍 응답은 본문을 내보내는 동안 쿼리가 돈다 (예: 변경 피드) — 다 보낸 뒤에 기록
+            response.streaming_content = self.stream(response.streaming_content, recorder, finish)
+        else:
+            finish()
+        return response
+
+    @staticmethod
+    def stream(content, recorder, finish):
+        """청크를 하나 만들 때마다만 execute_wrapper 를 건다 (서버가 내보내는 동안에는 빼 둔다)"""
+        iterator = iter(content)
+        try:
+            while True:
+                with connection.execute_wrapper(recorder):
+                    chunk = next(iterator, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            finish()
+
+    def log_slow_request(self, request, view, duration, recorder):
+        worst = sorted(recorder.queries, key=lambda q: q[0], reverse=True)[:SLOW_SQL_SHOWN]
+        logger.warning(
+            'slow request %s %s (%s): %.1fms, %d queries, db %.1fms\n%s',
+            request.method, request.get_full_path(), view,
+            duration * 1000, len(recorder.queries), recorder.db_time * 1000,
+            '\n'.join(f'  {elapsed * 1000:.1f}ms {sql[:SLOW_SQL_CHARS]}' for elapsed, sql in worst),
+        )
+
+
+def _metrics_allowed(request):
+    token = getattr(settings, 'WEBTOON_METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if token and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode()):
+        return True
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    if request.META.get('REMOTE_ADDR') in getattr(settings, 'WEBTOON_METRICS_ALLOWED_IPS', []):
+        return True
+    return getattr(settings, 'WEBTOON_METRICS_PUBLIC', False)
+
+
+def metrics_view(request):
+    """Prometheus 수집용 (Bearer 토큰, staff 사용자, 허용 IP, 또는 WEBTOON_METRICS_PUBLIC 일 때만)"""
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
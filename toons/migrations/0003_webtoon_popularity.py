@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def populate_popularity(apps, schema_editor):
+    Webtoon = apps.get_model('toons', 'Webtoon')
+    Through = Webtoon.favorited_by.through
+    user_field = Webtoon._meta.get_field('favorited_by').m2m_reverse_field_name()
+    rows = Through.objects.values('webtoon_id').annotate(
+        total=Count('id'),
+        male=Count('id', filter=Q(**{f'{user_field}__gender': 'M'})),
+        female=Count('id', filter=Q(**{f'{user_field}__gender': 'F'})),
+    )
+    for row in rows:
+        Webtoon.objects.filter(pk=row['webtoon_id']).update(
+            favorites_count=row['total'],
+            favorites_male_count=row['male'],
+            favorites_female_count=row['female'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0002_catalogstate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        # populate_popularity 가 사용자 gender 로 나눠 센다
+        ('accounts', '0003_customuser_gender'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webtoon',
+            name='favorites_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='favorites_female_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='favorites_male_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='webtoon',
+            index=models.Index(fields=['provider', '-favorites_count', '-id'], name='webtoon_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='webtoon',
+            index=models.Index(fields=['provider', '-favorites_male_count', '-id'], name='webtoon_popular_m_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='webtoon',
+            index=models.Index(fields=['provider', '-favorites_female_count', '-id'], name='webtoon_popular_f_idx'),
+        ),
+        migrations.RunPython(populate_popularity, migrations.RunPython.noop),
+    ]
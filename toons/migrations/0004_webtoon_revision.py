@@ -0,0 +1,42 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0003_webtoon_popularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebtoonTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('webtoon_id', models.BigIntegerField()),
+                ('revision', models.PositiveBigIntegerField(db_index=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='created_revision',
+            field=models.PositiveBigIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='revision',
+            field=models.PositiveBigIntegerField(db_index=True, default=0),
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
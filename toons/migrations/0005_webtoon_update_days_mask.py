@@ -0,0 +1,52 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+# 이 마이그레이션 시점의 schedule.days_to_mask 사본 (월=1, 화=2, ... 일=64)
+DAY_BITS = {
+    **{day: 1 << i for i, day in enumerate(['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'])},
+    **{day: 1 << i for i, day in enumerate(['월', '화', '수', '목', '금', '토', '일'])},
+    **{day: 1 << i for i, day in enumerate(
+        ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+    )},
+}
+
+
+def days_to_mask(text):
+    mask = 0
+    for token in str(text or '').split(','):
+        token = token.strip().lower()
+        if token.endswith('요일'):
+            token = token[:-2]
+        mask |= DAY_BITS.get(token, 0)
+    return mask
+
+
+def populate_masks(apps, schema_editor):
+    Webtoon = apps.get_model('toons', 'Webtoon')
+    webtoons = list(Webtoon.objects.only('id', 'update_days'))
+    for webtoon in webtoons:
+        webtoon.update_days_mask = days_to_mask(webtoon.update_days)
+    Webtoon.objects.bulk_update(webtoons, ['update_days_mask'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0004_webtoon_revision'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webtoon',
+            name='update_days_mask',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='webtoon',
+            index=models.Index(fields=['provider', 'update_days_mask'], name='webtoon_schedule_idx'),
+        ),
+        migrations.RunPython(populate_masks, migrations.RunPython.noop),
+    ]
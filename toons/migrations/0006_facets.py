@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0005_webtoon_update_days_mask'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=15)),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=255)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='webtoon',
+            index=models.Index(fields=['provider', 'is_adult', '-id'], name='webtoon_list_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facetcount',
+            index=models.Index(fields=['provider', 'facet', '-count'], name='facet_count_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='facetcount',
+            constraint=models.UniqueConstraint(fields=('provider', 'facet', 'value'), name='unique_facet_value'),
+        ),
+    ]
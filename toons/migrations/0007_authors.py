@@ -0,0 +1,70 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+ROLES = {'writers': 'writer', 'painters': 'painter', 'original_author': 'original'}
+
+
+def split_names(text):
+    return [name.strip() for name in str(text or '').split(',') if name.strip()]
+
+
+def populate_authors(apps, schema_editor):
+    Webtoon = apps.get_model('toons', 'Webtoon')
+    Author = apps.get_model('toons', 'Author')
+    WebtoonAuthor = apps.get_model('toons', 'WebtoonAuthor')
+
+    credits = []
+    for values in Webtoon.objects.values('id', *ROLES).iterator(chunk_size=2000):
+        for field, role in ROLES.items():
+            for name in split_names(values[field]):
+                credits.append((values['id'], name[:255], role))
+
+    names = {name for _, name, _ in credits}
+    Author.objects.bulk_create([Author(name=name) for name in names], ignore_conflicts=True, batch_size=1000)
+    author_ids = dict(Author.objects.values_list('name', 'id'))
+    WebtoonAuthor.objects.bulk_create(
+        [WebtoonAuthor(webtoon_id=pk, author_id=author_ids[name], role=role) for pk, name, role in credits],
+        ignore_conflicts=True, batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0006_facets'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Author',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WebtoonAuthor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('writer', '글'), ('painter', '그림'), ('original', '원작')], max_length=10)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='toons.author')),
+                ('webtoon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='credits', to='toons.webtoon')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='authors',
+            field=models.ManyToManyField(blank=True, related_name='webtoons', through='toons.WebtoonAuthor', to='toons.author'),
+        ),
+        migrations.AddIndex(
+            model_name='webtoonauthor',
+            index=models.Index(fields=['author', 'webtoon'], name='author_webtoon_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='webtoonauthor',
+            constraint=models.UniqueConstraint(fields=('webtoon', 'author', 'role'), name='unique_webtoon_author_role'),
+        ),
+        migrations.RunPython(populate_authors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0007_authors'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webtoon',
+            name='canonical_work',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def split_genres(apps, schema_editor):
+    """기존 Genre(원본 태그)와 웹툰 연결을 RawGenre 로 옮긴다
+
+    원본 태그 → 장르 묶음 매핑은 CSV 와 genres.TAG_ALIASES 에 있고 계속 바뀌므로 여기서는 쓰지 않는다.
+    묶음 Genre / 웹툰 장르 연결 / genre facet 개수는 migrate 다음에 `manage.py normalize_genres`
+    (warm_catalog 가 함께 실행) 가 만든다.
+    """
+    Webtoon = apps.get_model('toons', 'Webtoon')
+    Genre = apps.get_model('toons', 'Genre')
+    RawGenre = apps.get_model('toons', 'RawGenre')
+    FacetCount = apps.get_model('toons', 'FacetCount')
+    GenreLink = Webtoon.genres.through
+    RawLink = Webtoon.raw_genres.through
+
+    raw_tags = dict(Genre.objects.values_list('id', 'tag'))
+    links = list(GenreLink.objects.values_list('webtoon_id', 'genre_id'))
+
+    RawGenre.objects.bulk_create(
+        [RawGenre(tag=tag) for tag in raw_tags.values()], ignore_conflicts=True, batch_size=1000,
+    )
+    raw_ids = dict(RawGenre.objects.values_list('tag', 'id'))
+    RawLink.objects.bulk_create([
+        RawLink(webtoon_id=webtoon_id, rawgenre_id=raw_ids[raw_tags[genre_id]])
+        for webtoon_id, genre_id in links
+    ], ignore_conflicts=True, batch_size=1000)
+
+    # Genre 는 이제 묶음 이름만 담는다
+    GenreLink.objects.all().delete()
+    Genre.objects.all().delete()
+    FacetCount.objects.filter(facet='genre').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0008_webtoon_canonical_work'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RawGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.CharField(max_length=50, unique=True)),
+                ('genre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='raw_tags', to='toons.genre')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='webtoon',
+            name='raw_genres',
+            field=models.ManyToManyField(blank=True, related_name='webtoons', to='toons.rawgenre'),
+        ),
+        migrations.RunPython(split_genres, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0009_raw_genres'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('viewed_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_history', to=settings.AUTH_USER_MODEL)),
+                ('webtoon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='toons.webtoon')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', '-viewed_at'], name='view_history_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'webtoon'), name='unique_view_history')],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:17
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0010_view_history'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # 자동 생성 M2M 테이블(toons_webtoon_favorited_by)을 그대로 Favorite 모델로 넘긴다 (DB 변경 없음)
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Favorite',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('user', models.ForeignKey(db_column='customuser_id', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                        ('webtoon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='toons.webtoon')),
+                    ],
+                    options={
+                        'db_table': 'toons_webtoon_favorited_by',
+                        'unique_together': {('webtoon', 'user')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='webtoon',
+                    name='favorited_by',
+                    field=models.ManyToManyField(blank=True, related_name='favorite_webtoons', through='toons.Favorite', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[],
+        ),
+        # 기존 행은 추가 시각을 알 수 없으므로 NULL 로 두고 (마이그레이션 시각으로 채우면 해제할 때
+        # 그 시간 버킷의 다른 사용자 추가 수를 빼게 된다), 새 행부터 기본값을 쓴다
+        migrations.AddField(
+            model_name='favorite',
+            name='created_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='favorite',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, null=True),
+        ),
+        migrations.CreateModel(
+            name='FavoriteBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('webtoon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='toons.webtoon')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='favorite_bucket_hour_idx')],
+                'constraints': [models.UniqueConstraint(fields=('webtoon', 'hour'), name='unique_favorite_bucket')],
+            },
+        ),
+    ]
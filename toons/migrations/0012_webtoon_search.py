@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 16:31
+
+import django.db.models.deletion
+import toons.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0011_favorite_through'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebtoonSearch',
+            fields=[
+                ('webtoon', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='toons.webtoon')),
+                ('document', toons.search.SearchDocumentField(db_column='toons_webtoon_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'toons_webtoon_fts',
+                'managed': False,
+            },
+        ),
+    ]
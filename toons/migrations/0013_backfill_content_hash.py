@@ -0,0 +1,46 @@
+import hashlib
+
+from django.db import migrations
+
+# 이 마이그레이션 시점의 importers.FIELD_COLUMNS / content_hash 사본.
+# 나중에 importers 쪽이 바뀌어도 이 마이그레이션이 하는 일은 바뀌지 않아야 한다.
+HASH_FIELDS = [
+    'title', 'writers', 'painters', 'original_author', 'update_days', 'thumbnail', 'is_adult', 'synopsis',
+]
+
+
+def content_hash(values, tags):
+    parts = [str(values[field]) for field in HASH_FIELDS]
+    parts.append(','.join(sorted(set(tags))))
+    return hashlib.md5('\x1f'.join(parts).encode()).hexdigest()
+
+
+def backfill_content_hash(apps, schema_editor):
+    """해시가 비어 있는 웹툰(0004 이전에 적재된 행)의 내용 해시를 지금 값 + 원본 장르 태그로 채운다
+
+    비워 두면 다음 import_webtoons 가 같은 CSV 로도 모든 행을 다시 쓰고 장르/작가 연결을 다시 만든다.
+    revision 은 올리지 않는다 (내용이 바뀐 게 아님).
+    """
+    Webtoon = apps.get_model('toons', 'Webtoon')
+    RawLink = Webtoon.raw_genres.through
+
+    tags = {}
+    for webtoon_id, tag in RawLink.objects.values_list('webtoon_id', 'rawgenre__tag'):
+        tags.setdefault(webtoon_id, []).append(tag)
+
+    webtoons = list(Webtoon.objects.filter(content_hash='').only('id', *HASH_FIELDS))
+    for webtoon in webtoons:
+        values = {field: getattr(webtoon, field) for field in HASH_FIELDS}
+        webtoon.content_hash = content_hash(values, tags.get(webtoon.id, []))
+    Webtoon.objects.bulk_update(webtoons, ['content_hash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('toons', '0012_webtoon_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,32 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
+
+from .search import FTS_TABLE, SearchDocumentField
 
 # Create your models here.
+class Author(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
 class Genre(models.Model):
+    # 장르 묶음 이름 (genres.genre_cluster 로 정규화한 값)
     tag = models.CharField(max_length=50, unique=True, db_index=True)
 
     def __str__(self):
         return self.tag
+
+
+class RawGenre(models.Model):
+    """플랫폼에서 받은 장르 태그 원본 (정규화 전)"""
+    tag = models.CharField(max_length=50, unique=True)
+    genre = models.ForeignKey(Genre, on_delete=models.SET_NULL, null=True, blank=True, related_name='raw_tags')
+
+    def __str__(self):
+        return self.tag
     
 class Webtoon(models.Model):
     provider = models.CharField(max_length=15)
@@ -15,19 +35,183 @@ class Webtoon(models.Model):
     painters = models.CharField(max_length=255)
     original_author = models.CharField(max_length=255, blank=True)
     update_days = models.CharField(max_length=50)
+    # 연재 요일 비트마스크 (월=1 ... 일=64, schedule.days_to_mask)
+    update_days_mask = models.PositiveSmallIntegerField(default=0)
     thumbnail = models.URLField()
     url = models.URLField()
     is_adult = models.BooleanField(default=False)
     synopsis = models.TextField()
     genres = models.ManyToManyField(Genre, related_name='webtoons', blank=True)
+    raw_genres = models.ManyToManyField(RawGenre, related_name='webtoons', blank=True)
+    # writers/painters/original_author 문자열을 이름 단위로 나눈 작가 (역할 포함)
+    authors = models.ManyToManyField(Author, through='WebtoonAuthor', related_name='webtoons', blank=True)
 
     # ManyToMany로 즐겨찾기 관계 설정
     favorited_by = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
+        through='Favorite',
         related_name='favorite_webtoons',
         blank=True
     )
+
+    # 변경 감지용: 내용 해시가 바뀐 행만 다시 쓰고, 쓸 때의 카탈로그 버전을 revision 으로 남긴다
+    content_hash = models.CharField(max_length=32, blank=True)
+    created_revision = models.PositiveBigIntegerField(default=0, db_index=True)
+    revision = models.PositiveBigIntegerField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # 플랫폼 간 같은 작품 묶음 id (묶음 안 최소 웹툰 id, works.build_canonical_works 로 계산)
+    canonical_work = models.BigIntegerField(null=True, blank=True, db_index=True)
+
+    # 인기순 정렬용 즐겨찾기 수 (favorites.py 에서 F() 로 갱신, rebuild_popularity 로 재계산)
+    favorites_count = models.PositiveIntegerField(default=0)
+    favorites_male_count = models.PositiveIntegerField(default=0)
+    favorites_female_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['provider', 'is_adult', '-id'], name='webtoon_list_idx'),
+            models.Index(fields=['provider', 'update_days_mask'], name='webtoon_schedule_idx'),
+            models.Index(fields=['provider', '-favorites_count', '-id'], name='webtoon_popular_idx'),
+            models.Index(fields=['provider', '-favorites_male_count', '-id'], name='webtoon_popular_m_idx'),
+            models.Index(fields=['provider', '-favorites_female_count', '-id'], name='webtoon_popular_f_idx'),
+        ]
     
     def __str__(self):
         return self.title
-    
\ No newline at end of file
+
+
+class Favorite(models.Model):
+    """즐겨찾기 관계 (예전 자동 생성 M2M 테이블을 그대로 쓰고 추가 시각만 더함)"""
+    webtoon = models.ForeignKey(Webtoon, on_delete=models.CASCADE)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_column='customuser_id')
+    # 마이그레이션 0011 이전에 추가된 즐겨찾기는 추가 시각을 몰라서 NULL
+    created_at = models.DateTimeField(default=timezone.now, null=True)
+
+    class Meta:
+        db_table = 'toons_webtoon_favorited_by'
+        unique_together = [('webtoon', 'user')]
+
+    def __str__(self):
+        return f'{self.user} ♥ {self.webtoon}'
+
+
+class FavoriteBucket(models.Model):
+    """웹툰별 시간 단위 즐겨찾기 추가 수 (trending.py, 최근 7일치만 남김)"""
+    webtoon = models.ForeignKey(Webtoon, on_delete=models.CASCADE, related_name='+')
+    hour = models.DateTimeField()  # 정시로 자른 시각
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['webtoon', 'hour'], name='unique_favorite_bucket'),
+        ]
+        indexes = [
+            models.Index(fields=['hour'], name='favorite_bucket_hour_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.webtoon} {self.hour:%Y-%m-%d %H}시 +{self.count}'
+
+
+class WebtoonAuthor(models.Model):
+    WRITER = 'writer'
+    PAINTER = 'painter'
+    ORIGINAL = 'original'
+    ROLE_CHOICES = [
+        (WRITER, '글'),
+        (PAINTER, '그림'),
+        (ORIGINAL, '원작'),
+    ]
+
+    webtoon = models.ForeignKey(Webtoon, on_delete=models.CASCADE, related_name='credits')
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='credits')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['webtoon', 'author', 'role'], name='unique_webtoon_author_role'),
+        ]
+        indexes = [
+            models.Index(fields=['author', 'webtoon'], name='author_webtoon_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.webtoon} - {self.author} ({self.role})'
+
+
+class WebtoonTombstone(models.Model):
+    """삭제된 웹툰 기록 (변경 피드의 removed 용)"""
+    webtoon_id = models.BigIntegerField()
+    revision = models.PositiveBigIntegerField(db_index=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.webtoon_id} @ {self.revision}'
+
+
+class WebtoonSearch(models.Model):
+    """검색 색인 (search.py 가 만들고 트리거로 채우는 FTS5 가상 테이블, rowid = 웹툰 id)
+
+    마이그레이션으로 만들지 않으며, 검색 쿼리에서 조인/정렬용으로만 쓴다.
+    """
+    webtoon = models.OneToOneField(
+        Webtoon, primary_key=True, db_column='rowid', db_constraint=False,
+        on_delete=models.DO_NOTHING, related_name='search_index',
+    )
+    document = SearchDocumentField(db_column=FTS_TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+
+class ViewHistory(models.Model):
+    """최근 본 웹툰 (사용자 + 웹툰당 한 행, history.py 가 모아서 기록하고 사용자당 N개만 남긴다)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='view_history')
+    webtoon = models.ForeignKey(Webtoon, on_delete=models.CASCADE, related_name='+')
+    viewed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'webtoon'], name='unique_view_history'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-viewed_at'], name='view_history_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.user} - {self.webtoon} ({self.viewed_at})'
+
+
+class FacetCount(models.Model):
+    """플랫폼별 facet 값의 웹툰 수 (적재 시 facets.refresh_facets 로 미리 계산)"""
+    provider = models.CharField(max_length=15)
+    facet = models.CharField(max_length=20)
+    value = models.CharField(max_length=255)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['provider', 'facet', 'value'], name='unique_facet_value'),
+        ]
+        indexes = [
+            models.Index(fields=['provider', 'facet', '-count'], name='facet_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.provider} {self.facet}={self.value} ({self.count})'
+
+
+class CatalogState(models.Model):
+    """카탈로그 버전 (적재로 웹툰 데이터가 바뀔 때마다 1씩 증가)
+
+    응답 캐시 키에 버전을 넣어 두므로 버전만 올리면 이전 캐시는 모두 무효가 된다.
+    management command 로 적재해도 웹 프로세스가 알 수 있도록 DB에 둔다.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'catalog v{self.version}'
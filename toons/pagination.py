@@ -0,0 +1,85 @@
+"""id 기준 keyset(cursor) 페이징
+
+OFFSET 없이 `id < 마지막 id` 조건으로 다음 페이지를 가져오므로
+몇 번째 페이지든 같은 속도로 응답하고, COUNT(*) 쿼리도 하지 않는다.
+인기순은 (카운터, id) 를 cursor 에 넣어 같은 방식으로 이어 간다.
+"""
+import base64
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Q
+
+COUNT_CACHE_TIMEOUT = 300  # seconds
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(last_id, sort_field=None, sort_value=None):
+    raw = f'id:{last_id}' if sort_field is None else f'{sort_field}:{sort_value}:{last_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort_field=None):
+    """cursor → (정렬 값, 마지막 id). cursor 가 없으면 None
+
+    cursor 에는 정렬 필드 이름이 들어 있어서, 다른 정렬에서 받은 cursor 는 InvalidCursor.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        parts = base64.urlsafe_b64decode(padded).decode().split(':')
+        if sort_field is None:
+            prefix, value = parts
+            if prefix != 'id':
+                raise ValueError(prefix)
+            return None, int(value)
+        prefix, sort_value, value = parts
+        if prefix != sort_field:
+            raise ValueError(prefix)
+        return int(sort_value), int(value)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor(cursor) from e
+
+
+def paginate_by_cursor(queryset, cursor, per_page, sort_field=None):
+    """'-id' (sort_field 가 있으면 '-sort_field, -id') 순으로 cursor 다음 페이지를 가져온다.
+
+    정렬은 여기서 다시 정하므로 queryset 의 다른 정렬(검색 관련도 등)은 쓰지 않는다.
+    sort_field 는 정수 필드여야 한다 (인기 카운터).
+    (items, next_cursor) 를 돌려주며, 마지막 페이지면 next_cursor는 None.
+    """
+    per_page = max(1, per_page)
+    position = decode_cursor(cursor, sort_field)
+    if position is not None:
+        sort_value, last_id = position
+        if sort_field is None:
+            queryset = queryset.filter(id__lt=last_id)
+        else:
+            queryset = queryset.filter(
+                Q(**{f'{sort_field}__lt': sort_value}) | Q(**{sort_field: sort_value, 'id__lt': last_id})
+            )
+    ordering = ['-id'] if sort_field is None else [f'-{sort_field}', '-id']
+    # 한 개 더 가져와서 다음 페이지 존재 여부를 판단 (COUNT 없이)
+    items = list(queryset.order_by(*ordering)[:per_page + 1])
+    if len(items) > per_page:
+        items = items[:per_page]
+        last = items[-1]
+        if sort_field is None:
+            return items, encode_cursor(last.id)
+        return items, encode_cursor(last.id, sort_field, getattr(last, sort_field))
+    return items, None
+
+
+def cached_count(queryset, version, *key_parts, timeout=COUNT_CACHE_TIMEOUT):
+    """필터 조건별 전체 개수를 캐시에서 꺼내거나 한 번 세어서 저장"""
+    digest = hashlib.md5('|'.join(str(p) for p in key_parts).encode()).hexdigest()
+    key = f'toons:v{version}:count:{digest}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
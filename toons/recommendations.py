@@ -0,0 +1,65 @@
+"""즐겨찾기 기반 개인화 추천
+
+사용자가 즐겨찾기한 웹툰들의 장르 벡터 평균을 취향 벡터로 삼고,
+build_similarity 가 저장해 둔 (정규화된) 장르 행렬과 행렬-벡터 곱 한 번으로
+전체 카탈로그 점수를 매긴다. 이미 즐겨찾기한 웹툰과 성인 웹툰은 제외한다.
+
+결과는 사용자별로 캐시하며, 키에 favorites_version 이 들어가 있으므로
+즐겨찾기를 토글하면 자연스럽게 새로 계산된다.
+"""
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .artifacts import load_neighbors
+from .similarity import GENRE_SIMILARITY
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def _cache_key(user, index, limit):
+    return f'toons:recs:{user.pk}:{user.favorites_version}:{index.built_at}:{limit}'
+
+
+def score_catalog(index, favorite_ids, limit):
+    """[(웹툰 id, 점수), ...] 점수 내림차순"""
+    matrix = index.array('matrix')
+    rows = index.rows_of(favorite_ids)
+    if matrix is None or not len(rows):
+        return []
+
+    taste = np.asarray(matrix[rows]).sum(axis=0)
+    norm = np.linalg.norm(taste)
+    if not norm:
+        return []
+    scores = matrix @ (taste / norm)
+
+    scores[rows] = -np.inf
+    adult = index.array('adult')
+    if adult is not None:
+        scores[adult] = -np.inf
+
+    limit = min(limit, len(scores))
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [
+        (int(index.ids[i]), float(scores[i]))
+        for i in top
+        if scores[i] > 0
+    ]
+
+
+def recommend_for(user, limit=DEFAULT_LIMIT):
+    """추천 목록 [(웹툰 id, 점수), ...]. 유사도 artifact 가 없으면 None"""
+    index = load_neighbors(GENRE_SIMILARITY)
+    if index is None:
+        return None
+
+    key = _cache_key(user, index, limit)
+    recommended = cache.get(key)
+    if recommended is None:
+        favorite_ids = list(user.favorite_webtoons.values_list('id', flat=True))
+        recommended = score_catalog(index, favorite_ids, limit)
+        cache.set(key, recommended, settings.WEBTOON_RESPONSE_CACHE_TIMEOUT)
+    return recommended
@@ -0,0 +1,43 @@
+"""연재 요일 정규화
+
+update_days 문자열("목, 월", "MON,THU" 등)을 월=1, 화=2, 수=4 ... 일=64 비트마스크로 바꾼다.
+특정 요일을 포함하는 마스크는 64개뿐이므로 `update_days_mask IN (...)` 조건으로
+(provider, update_days_mask) 인덱스를 그대로 탈 수 있다.
+"""
+DAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+DAY_BITS = {day: 1 << i for i, day in enumerate(DAYS)}
+ALL_DAYS_MASK = (1 << len(DAYS)) - 1
+
+# 표기 → 요일 코드
+DAY_ALIASES = {
+    **{day: day for day in DAYS},
+    **dict(zip(['월', '화', '수', '목', '금', '토', '일'], DAYS)),
+    **dict(zip(['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'], DAYS)),
+}
+
+
+def normalize_day(token):
+    """'월', 'MON', '월요일' → 'mon'. 알 수 없으면 None"""
+    token = token.strip().lower()
+    if token.endswith('요일'):
+        token = token[:-2]
+    return DAY_ALIASES.get(token)
+
+
+def days_to_mask(text):
+    mask = 0
+    for token in str(text or '').split(','):
+        day = normalize_day(token)
+        if day:
+            mask |= DAY_BITS[day]
+    return mask
+
+
+def mask_to_days(mask):
+    return [day for day in DAYS if mask & DAY_BITS[day]]
+
+
+def masks_with(day):
+    """해당 요일 비트가 켜진 모든 마스크 값 (IN 조건용)"""
+    bit = DAY_BITS[day]
+    return [mask for mask in range(1, ALL_DAYS_MASK + 1) if mask & bit]
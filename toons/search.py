@@ -0,0 +1,146 @@
+"""웹툰 검색 인덱스 (SQLite FTS5 + trigram 토크나이저)
+
+title / writers / painters / original_author / synopsis 를 하나의 FTS5 외부 콘텐츠
+테이블로 색인한다. trigram 토크나이저는 부분 문자열 일치를 지원하므로 한국어 제목도
+띄어쓰기와 상관없이 찾을 수 있다. 색인은 toons_webtoon 테이블의 트리거로 동기화되므로
+bulk_create 로 적재해도 따로 갱신할 필요가 없다. UPDATE 트리거는 검색 컬럼이 바뀔 때만
+돌기 때문에 즐겨찾기 카운터나 revision 갱신은 색인을 건드리지 않는다.
+
+FTS5가 없는 DB(MySQL 등)나 3글자 미만 검색어는 icontains 검색으로 대신한다.
+"""
+from django.db import connection
+from django.db import models
+from django.db.models import Lookup, Q
+
+FTS_TABLE = 'toons_webtoon_fts'
+SEARCH_FIELDS = ['title', 'writers', 'painters', 'original_author', 'synopsis']
+TRIGRAM_MIN_LENGTH = 3
+
+_COLUMNS = ', '.join(SEARCH_FIELDS)
+_NEW_VALUES = ', '.join(f'new.{f}' for f in SEARCH_FIELDS)
+_OLD_VALUES = ', '.join(f'old.{f}' for f in SEARCH_FIELDS)
+
+_CREATE_TABLE = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    {_COLUMNS},
+    content='toons_webtoon', content_rowid='id', tokenize='trigram'
+)
+"""
+
+_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON toons_webtoon BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW_VALUES});
+        END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON toons_webtoon BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD_VALUES});
+        END
+    """,
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_COLUMNS} ON toons_webtoon BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD_VALUES});
+            INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW_VALUES});
+        END
+    """,
+}
+
+_fts_available = None
+
+
+class SearchDocumentField(models.TextField):
+    """FTS5 테이블 이름과 같은 숨은 컬럼. `document__match=식` 으로 MATCH 조건을 건다"""
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+def fts_available():
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+    return _fts_available
+
+
+def _normalize_sql(sql):
+    # sqlite_master 에는 IF NOT EXISTS 가 빠진 채로 저장된다
+    return ' '.join(sql.replace('IF NOT EXISTS ', '').split())
+
+
+def install_search_index(using=None):
+    """FTS 테이블과 동기화 트리거를 만든다 (post_migrate 에서 호출).
+
+    SQLite 마이그레이션은 테이블을 다시 만들면서 트리거를 지우기도 하므로
+    트리거가 하나라도 없었다면 색인 전체를 다시 만든다.
+    """
+    global _fts_available
+    from django.db import connections
+    conn = connections[using or 'default']
+    if conn.vendor != 'sqlite':
+        return False
+
+    with conn.cursor() as cursor:
+        # 일부 앱만 migrate 했거나 검색 컬럼이 아직 없는 시점이면 다음 migrate 에서 만든다
+        if 'toons_webtoon' not in conn.introspection.table_names(cursor):
+            return False
+        columns = {c.name for c in conn.introspection.get_table_description(cursor, 'toons_webtoon')}
+        if not set(SEARCH_FIELDS) <= columns:
+            return False
+
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")
+        existing = dict(cursor.fetchall())
+        cursor.execute(_CREATE_TABLE)
+        for name, sql in _TRIGGERS.items():
+            # 정의가 바뀐 트리거(예: 예전의 모든 컬럼 AFTER UPDATE)는 다시 만든다
+            if name in existing and _normalize_sql(existing[name]) != _normalize_sql(sql):
+                cursor.execute(f'DROP TRIGGER {name}')
+            cursor.execute(sql)
+        rebuilt = not set(_TRIGGERS) <= existing.keys()
+        if rebuilt:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    _fts_available = None
+    return rebuilt
+
+
+def _match_expression(terms):
+    # 각 단어를 큰따옴표로 감싸 FTS 문법 문자를 무력화하고 AND 로 묶는다
+    return ' AND '.join('"{}"'.format(t.replace('"', '""')) for t in terms)
+
+
+def _icontains(term):
+    q = Q()
+    for field in SEARCH_FIELDS:
+        q |= Q(**{f'{field}__icontains': term})
+    return q
+
+
+def search_webtoons(queryset, q):
+    """queryset 을 검색어로 거르고 관련도 순으로 정렬해서 돌려준다"""
+    terms = q.split()
+    if not terms:
+        return queryset
+
+    long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+    short_terms = [t for t in terms if len(t) < TRIGRAM_MIN_LENGTH]
+
+    if not (long_terms and fts_available()):
+        for term in terms:
+            queryset = queryset.filter(_icontains(term))
+        return queryset
+
+    # trigram 으로 색인되지 않는 짧은 단어는 icontains 로 추가로 거른다
+    for term in short_terms:
+        queryset = queryset.filter(_icontains(term))
+
+    # 색인 테이블(models.WebtoonSearch)과 rowid 로 조인해서 MATCH 로 거르고 rank 로 정렬
+    return queryset.filter(
+        search_index__document__match=_match_expression(long_terms),
+    ).order_by('search_index__rank')
@@ -1,11 +1,44 @@
 from rest_framework import serializers
 from .models import Webtoon
 
+
+def favorite_ids_for(request, ids):
+    """현재 사용자가 즐겨찾기한 웹툰 id 집합 (쿼리 1번)"""
+    if not (request and request.user.is_authenticated):
+        return set()
+    if not ids:
+        return set()
+    return set(
+        request.user.favorite_webtoons.filter(id__in=ids).values_list('id', flat=True)
+    )
+
+
+def apply_favorites(items, request):
+    """캐시에서 꺼낸 직렬화 결과(dict 목록)에 사용자별 is_favorited 를 덧씌운다"""
+    favorite_ids = favorite_ids_for(request, [item['id'] for item in items])
+    for item in items:
+        item['is_favorited'] = item['id'] in favorite_ids
+    return items
+
+
+class WebtoonListSerializer(serializers.ListSerializer):
+    """목록 직렬화 시 즐겨찾기 여부를 한 번에 조회해서 context에 넣어 둔다"""
+
+    def to_representation(self, data):
+        webtoons = list(data.all() if hasattr(data, 'all') else data)
+        if 'favorite_ids' not in self.context:
+            self.context['favorite_ids'] = favorite_ids_for(
+                self.context.get('request'), [w.id for w in webtoons]
+            )
+        return super().to_representation(webtoons)
+
+
 class WebtoonSerializer(serializers.ModelSerializer):
     is_favorited = serializers.SerializerMethodField()
 
     class Meta:
         model = Webtoon
+        list_serializer_class = WebtoonListSerializer
         fields = [
             'id',
             'provider',
@@ -15,10 +48,14 @@ class WebtoonSerializer(serializers.ModelSerializer):
             'thumbnail',
             'url',
             'is_adult',      # is_end → is_adult 로 교체
+            'canonical_work',
             'is_favorited',
         ]
 
     def get_is_favorited(self, obj):
+        favorite_ids = self.context.get('favorite_ids')
+        if favorite_ids is not None:
+            return obj.id in favorite_ids
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.favorited_by.filter(id=request.user.id).exists()
@@ -0,0 +1,101 @@
+"""장르 기반 유사 웹툰 계산
+
+웹툰별 장르를 multi-hot 행렬로 만들고 행을 L2 정규화한 뒤,
+배치 단위 행렬곱으로 코사인 유사도 top-k 이웃을 구해 artifact 로 저장한다.
+요청 처리 중에는 행렬 연산을 하지 않고 artifacts.load_neighbors 로 읽기만 한다.
+"""
+import time
+
+import numpy as np
+
+from .artifacts import save_neighbors
+from .catalog import get_catalog_version
+from .models import Webtoon
+
+GENRE_SIMILARITY = 'genre_similarity'
+DEFAULT_TOP_K = 20
+DEFAULT_BATCH_SIZE = 512
+
+
+def build_genre_matrix():
+    """(ids, genre_ids, matrix) — matrix[i, j] = 1 이면 ids[i] 웹툰이 genre_ids[j] 장르"""
+    ids = np.fromiter(
+        Webtoon.objects.order_by('id').values_list('id', flat=True), dtype=np.int64,
+    )
+    links = np.array(
+        list(Webtoon.genres.through.objects.values_list('webtoon_id', 'genre_id')),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+    genre_ids = np.unique(links[:, 1])
+    matrix = np.zeros((len(ids), len(genre_ids)), dtype=np.float32)
+    rows = np.searchsorted(ids, links[:, 0])
+    cols = np.searchsorted(genre_ids, links[:, 1])
+    matrix[rows, cols] = 1.0
+    return ids, genre_ids, matrix
+
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def select_top_k(sims, k):
+    """배치 유사도 (b, n) 에서 행마다 top-k (열 번호, 점수) 점수 내림차순"""
+    part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(sims, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+
+def top_k_neighbors(matrix, k=DEFAULT_TOP_K, batch_size=DEFAULT_BATCH_SIZE):
+    """L2 정규화된 행렬에서 행마다 자기 자신을 뺀 코사인 top-k (행 번호, 점수)"""
+    n = matrix.shape[0]
+    k = min(k, max(n - 1, 0))
+    neighbors = np.full((n, k), -1, dtype=np.int64)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return neighbors, scores
+
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        sims = matrix[start:stop] @ matrix.T
+        sims[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        neighbors[start:stop], scores[start:stop] = select_top_k(sims, k)
+
+    # 장르가 하나도 겹치지 않는 이웃은 빈 칸으로
+    neighbors[scores <= 0] = -1
+    scores[scores <= 0] = 0
+    return neighbors, scores
+
+
+def build_genre_similarity(k=DEFAULT_TOP_K, batch_size=DEFAULT_BATCH_SIZE):
+    started = time.perf_counter()
+    version = get_catalog_version()
+    ids, genre_ids, matrix = build_genre_matrix()
+    matrix = normalize_rows(matrix)
+    neighbors, scores = top_k_neighbors(matrix, k=k, batch_size=batch_size)
+    adult_ids = np.fromiter(
+        Webtoon.objects.filter(is_adult=True).values_list('id', flat=True), dtype=np.int64,
+    )
+
+    # 행 번호 → 웹툰 id
+    neighbor_ids = np.where(neighbors >= 0, ids[np.clip(neighbors, 0, None)], -1)
+    path = save_neighbors(
+        GENRE_SIMILARITY, ids, neighbor_ids, scores,
+        # 추천(recommendations.py)이 요청마다 행렬을 다시 만들지 않도록 함께 저장
+        arrays={
+            'matrix': matrix,
+            'genre_ids': genre_ids,
+            'adult': np.isin(ids, adult_ids),
+        },
+        catalog_version=version, genres=int(len(genre_ids)),
+    )
+    return {
+        'path': str(path),
+        'webtoons': int(len(ids)),
+        'genres': int(len(genre_ids)),
+        'k': int(neighbors.shape[1]),
+        'elapsed': time.perf_counter() - started,
+    }
@@ -0,0 +1,192 @@
+"""검색창 자동완성 (제목/작가 이름 접두어 + 초성)
+
+키 입력마다 title__icontains 로 테이블을 훑지 않도록 프로세스 메모리에 접두어 색인을 둔다.
+
+- 키: 공백/문장부호를 지운 소문자 제목/이름("나 혼자만 레벨업" → "나혼자만레벨업")과, 같은 키를
+  초성("ㄴㅎㅈㅁㄹㅂㅇ") 순으로 다시 정렬한 목록.
+  단어 중간부터 쳐도 찾을 수 있게 각 단어 시작 위치부터의 접미사도 키로 넣는다.
+- 초성이 들어간 입력("ㄴㅎㅈ", "나ㅎ", "ㄴ혼자")은 글자 위치마다 음절 또는 그 초성과 맞으면 된다.
+  초성 키 범위를 bisect 로 찾은 뒤 음절로 친 위치만 원래 키와 비교한다.
+- 조회: 정렬된 키 목록에서 bisect 로 접두어 범위를 찾고 인기(즐겨찾기 수) 순으로 자른다.
+  한두 글자 접두어는 범위가 너무 넓으므로 색인을 만들 때 상위 결과를 미리 계산해 둔다.
+- 웹 프로세스가 뜰 때(config/wsgi.py, asgi.py) warm_suggest_index 로 미리 만들어 첫 요청이 기다리지 않게 한다.
+  카탈로그 버전이 바뀌거나 SUGGEST_MAX_AGE 가 지나면 다음 요청에서 다시 만든다.
+  다시 만드는 동안 다른 요청은 이전 색인을 그대로 쓴다.
+"""
+import heapq
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import product
+
+from django.db import DatabaseError
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+from .catalog import get_catalog_version
+from .models import Author, Webtoon
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_LIMIT = 20
+SUGGEST_MAX_AGE = 10 * 60  # seconds (즐겨찾기 수는 카탈로그 버전을 올리지 않으므로)
+SHORT_PREFIX = 2  # 이 길이 이하의 접두어는 상위 결과를 미리 계산
+SHORT_TOP = SUGGEST_MAX_LIMIT * 3  # 같은 작품 묶음을 걸러낸 뒤에도 limit 개가 남도록 넉넉히
+
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_SPACES = re.compile(r'\s+')
+_PUNCT = re.compile(r'[^\w\s]|_')
+
+
+def chosung(text):
+    """한글 음절은 초성으로, 나머지 글자는 그대로"""
+    chars = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        chars.append(CHOSUNG[code // 588] if 0 <= code < 11172 else ch)
+    return ''.join(chars)
+
+
+def normalize_query(text):
+    """공백/문장부호를 지운 소문자 ('여보, 나' → '여보나')"""
+    return _SPACES.sub('', _PUNCT.sub('', str(text or ''))).lower()
+
+
+def word_suffixes(text):
+    """단어 시작 위치마다 공백을 지운 접미사"""
+    words = _PUNCT.sub(' ', str(text or '')).lower().split()
+    return {''.join(words[i:]) for i in range(len(words))}
+
+
+class PrefixIndex:
+    """entries 는 인기순으로 정렬된 dict 목록"""
+
+    def __init__(self, entries, text_field):
+        self.entries = entries
+        pairs = sorted(
+            (key, i)
+            for i, entry in enumerate(entries)
+            for key in word_suffixes(entry[text_field])
+        )
+        self.keys = [key for key, _ in pairs]
+        self.refs = [i for _, i in pairs]
+
+        # 초성이 들어간 입력용: 같은 키를 초성 순으로 다시 정렬한 (원래 키, 항목 번호)
+        mixed = sorted((chosung(key), key, i) for key, i in pairs)
+        self.chosung_keys = [initials for initials, _, _ in mixed]
+        self.mixed = [(key, i) for _, key, i in mixed]
+
+        # entries 가 이미 인기순이므로 번호가 작을수록 인기 있는 항목.
+        # 짧은 접두어는 위치마다 음절/초성 두 가지를 모두 키로 ("나혼" → 나혼, 나ㅎ, ㄴ혼, ㄴㅎ)
+        short = defaultdict(set)
+        for _, key, i in mixed:
+            for n in range(1, min(SHORT_PREFIX, len(key)) + 1):
+                for variant in product(*({ch, chosung(ch)} for ch in key[:n])):
+                    short[''.join(variant)].add(i)
+        self.short = {prefix: heapq.nsmallest(SHORT_TOP, refs) for prefix, refs in short.items()}
+
+    def search(self, prefix):
+        """접두어가 맞는 항목을 인기순으로 (제너레이터)"""
+        if len(prefix) <= SHORT_PREFIX:
+            refs = self.short.get(prefix, [])
+        elif any(ch in CHOSUNG for ch in prefix):
+            initials = chosung(prefix)
+            lo = bisect_left(self.chosung_keys, initials)
+            hi = bisect_left(self.chosung_keys, initials + '\uffff', lo)
+            # 초성은 범위에서 이미 맞았으니 음절로 친 위치만 비교
+            typed = [(pos, ch) for pos, ch in enumerate(prefix) if ch not in CHOSUNG]
+            refs = sorted({
+                i for key, i in self.mixed[lo:hi]
+                if all(key[pos] == ch for pos, ch in typed)
+            })
+        else:
+            lo = bisect_left(self.keys, prefix)
+            hi = bisect_left(self.keys, prefix + '\uffff', lo)
+            refs = sorted(set(self.refs[lo:hi]))
+        for i in refs:
+            yield self.entries[i]
+
+
+class SuggestIndex:
+    def __init__(self, version):
+        self.version = version
+        self.built_at = time.monotonic()
+
+        webtoons = list(
+            Webtoon.objects.filter(is_adult=False)
+            .order_by('-favorites_count', '-id')
+            .values('id', 'title', 'provider', 'thumbnail', 'canonical_work')
+        )
+        authors = list(
+            Author.objects.annotate(
+                webtoon_count=Count('credits__webtoon', distinct=True),
+                popularity=Coalesce(Sum('credits__webtoon__favorites_count'), 0),
+            )
+            .filter(webtoon_count__gt=0)
+            .order_by('-popularity', '-webtoon_count', 'name')
+            .values('id', 'name', 'webtoon_count')
+        )
+        self.webtoons = PrefixIndex(webtoons, 'title')
+        self.authors = PrefixIndex(authors, 'name')
+
+    def suggest(self, q, limit=SUGGEST_LIMIT):
+        prefix = normalize_query(q)
+        if not prefix:
+            return {'webtoons': [], 'authors': []}
+
+        # 같은 작품이 여러 플랫폼에 있으면 가장 인기 있는 것 하나만
+        webtoons = []
+        seen_works = set()
+        for entry in self.webtoons.search(prefix):
+            work = entry['canonical_work'] or entry['id']
+            if work in seen_works:
+                continue
+            seen_works.add(work)
+            webtoons.append({key: entry[key] for key in ('id', 'title', 'provider', 'thumbnail')})
+            if len(webtoons) >= limit:
+                break
+
+        authors = []
+        for entry in self.authors.search(prefix):
+            authors.append(entry)
+            if len(authors) >= limit:
+                break
+        return {'webtoons': webtoons, 'authors': authors}
+
+    def is_stale(self, version):
+        return version != self.version or time.monotonic() - self.built_at > SUGGEST_MAX_AGE
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_suggest_index():
+    """프로세스 내 색인. 없으면 만들고, 오래됐으면 한 요청만 다시 만든다"""
+    global _index
+    version = get_catalog_version()
+    index = _index
+    if index is not None and not index.is_stale(version):
+        return index
+
+    # 처음에는 다 같이 기다리고, 갱신 중에는 나머지 요청이 이전 색인으로 응답
+    if not _lock.acquire(blocking=index is None):
+        return index
+    try:
+        if _index is None or _index.is_stale(version):
+            _index = SuggestIndex(version)
+        return _index
+    finally:
+        _lock.release()
+
+
+def warm_suggest_index():
+    """웹 프로세스 시작 시 색인을 미리 만든다. DB 가 아직 준비되지 않았으면 첫 요청으로 미룬다"""
+    try:
+        get_suggest_index()
+    except DatabaseError:
+        logger.warning('suggest index not built at startup', exc_info=True)
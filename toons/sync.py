@@ -0,0 +1,208 @@
+"""korea-webtoon-api 동기화 파이프라인
+
+플랫폼마다 페이지를 `concurrency` 개씩 묶어(웨이브) 동시에 요청하고,
+웨이브 안에서 처음 나온 빈 페이지에서 멈춘다. 받은 웹툰은 웨이브마다
+CatalogImporter.merge_chunk 로 한 번에 병합한다 (API 가 준 필드만 바꾼다).
+
+HTTP 요청은 asyncio.to_thread 로 requests 를 감싸서 동시에 보내고,
+DB 쓰기는 호출한 스레드에서 한다 (ORM 은 async 컨텍스트에서 쓸 수 없음).
+WEBTOON_API_BASE 를 로컬 stub 서버 주소로 바꾸면 녹화해 둔 페이지로 돌려볼 수 있다.
+"""
+import asyncio
+import time
+
+import requests
+from django.conf import settings
+
+from .importers import CatalogImporter
+
+# API provider 이름 → DB provider 이름
+PROVIDERS = {
+    'NAVER': 'NAVER',
+    'KAKAO': 'KAKAO',
+    'KAKAO_PAGE': 'KAKAOPAGE',
+}
+DAY_NAMES = {
+    'MON': '월', 'TUE': '화', 'WED': '수', 'THU': '목',
+    'FRI': '금', 'SAT': '토', 'SUN': '일',
+}
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_PAGES = 50
+DEFAULT_PER_PAGE = 100
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5  # seconds, 시도마다 2배
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class SyncError(Exception):
+    pass
+
+
+class SyncStats:
+    """동기화 결과 집계"""
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.pages = 0
+        self.items = 0
+        self.saved = 0  # 새로 만들거나 내용이 바뀌어 다시 쓴 웹툰 수
+        self.retries = 0
+        self.started_at = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def pages_per_second(self):
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def items_per_second(self):
+        return self.items / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'provider': self.provider,
+            'pages': self.pages,
+            'items': self.items,
+            'saved': self.saved,
+            'retries': self.retries,
+            'elapsed': round(self.elapsed, 3),
+            'pages_per_second': round(self.pages_per_second, 1),
+            'items_per_second': round(self.items_per_second, 1),
+        }
+
+
+def page_url(base_url, provider, page, per_page=DEFAULT_PER_PAGE):
+    return (
+        f"{base_url.rstrip('/')}/webtoons"
+        f"?provider={provider}&page={page}&perPage={per_page}&sort=ASC"
+    )
+
+
+def to_records(provider, webtoons):
+    """API 응답 항목 → CatalogImporter.merge_chunk 레코드 (업데이트 요일이 있는 것만)
+
+    API 가 주지 않는 필드(장르, 원작, 작가 역할, 비어 있는 줄거리 등)는 넣지 않으므로
+    기존 웹툰의 값과 장르/작가 연결이 그대로 남는다.
+    """
+    records = []
+    for toon in webtoons:
+        if not toon.get('updateDays'):
+            continue
+        record = {
+            'provider': PROVIDERS.get(provider, provider),
+            'url': toon['url'],
+            'title': toon['title'].strip(),
+            'update_days': ', '.join(DAY_NAMES.get(d, d) for d in toon['updateDays']),
+        }
+        if toon.get('thumbnail'):
+            record['thumbnail'] = toon['thumbnail'][0]
+        if 'isAdult' in toon or 'ageGrade' in toon:
+            record['is_adult'] = bool(toon.get('isAdult')) or (toon.get('ageGrade') or 0) >= 19
+        if toon.get('synopsis'):
+            record['synopsis'] = toon['synopsis']
+        if toon.get('authors'):
+            # 글/그림 구분이 없으므로 새 웹툰을 만들 때만 쓴다 (기존 웹툰의 작가는 CSV 값 유지)
+            authors = ', '.join(toon['authors'])
+            record['defaults'] = {'writers': authors, 'painters': authors}
+        records.append(record)
+    return records
+
+
+async def fetch_page(url, semaphore, timeout, retries, backoff, stats):
+    async with semaphore:
+        for attempt in range(retries + 1):
+            try:
+                response = await asyncio.to_thread(requests.get, url, timeout=timeout)
+                if response.status_code in RETRY_STATUS:
+                    raise requests.HTTPError(f'{response.status_code} {url}')
+                response.raise_for_status()
+                data = response.json()
+                if not isinstance(data, dict):
+                    raise ValueError(f'unexpected body {type(data).__name__}')
+                return data.get('webtoons', [])
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError, ValueError) as e:
+                # JSON 이 아닌 200 응답(프록시 오류 페이지 등)도 일시적인 실패로 보고 다시 시도
+                retryable = not isinstance(e, requests.HTTPError) or (
+                    e.response is None or e.response.status_code in RETRY_STATUS
+                )
+                if attempt == retries or not retryable:
+                    raise SyncError(f'{url}: {e}') from e
+                stats.retries += 1
+                await asyncio.sleep(backoff * (2 ** attempt))
+
+
+async def fetch_wave(urls, concurrency, timeout, retries, backoff, stats):
+    """페이지들을 동시에 받는다. 한 페이지가 실패해도 나머지가 끝날 때까지 기다린 뒤 첫 오류를 올린다
+    (먼저 올리면 루프를 닫을 때 끝나지 않은 태스크가 남는다)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*[
+        fetch_page(url, semaphore, timeout, retries, backoff, stats) for url in urls
+    ], return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def sync_provider(
+    provider,
+    base_url=None,
+    concurrency=DEFAULT_CONCURRENCY,
+    max_pages=DEFAULT_MAX_PAGES,
+    per_page=DEFAULT_PER_PAGE,
+    timeout=None,
+    retries=DEFAULT_RETRIES,
+    backoff=DEFAULT_BACKOFF,
+    importer=None,
+):
+    """플랫폼 하나를 동기화하고 SyncStats 를 돌려준다.
+
+    importer 를 넘기면 마무리(importer.finish)는 호출한 쪽에서 한다.
+    """
+    base_url = base_url or settings.WEBTOON_API_BASE
+    timeout = timeout or settings.WEBTOON_API_TIMEOUT
+    owns_importer = importer is None
+    importer = importer or CatalogImporter()
+    stats = SyncStats(provider)
+
+    loop = asyncio.new_event_loop()
+    try:
+        page = 1
+        while page <= max_pages:
+            pages = range(page, min(page + concurrency, max_pages + 1))
+            urls = [page_url(base_url, provider, p, per_page) for p in pages]
+            results = loop.run_until_complete(
+                fetch_wave(urls, concurrency, timeout, retries, backoff, stats)
+            )
+
+            # 첫 빈 페이지 뒤의 결과는 버린다
+            done = False
+            items = []
+            for page_items in results:
+                if not page_items:
+                    done = True
+                    break
+                stats.pages += 1
+                items.extend(page_items)
+            stats.items += len(items)
+
+            records = to_records(provider, items)
+            if records:
+                written_before = importer.stats.created + importer.stats.updated
+                importer.merge_chunk(records)
+                stats.saved += importer.stats.created + importer.stats.updated - written_before
+
+            if done:
+                break
+            page += len(pages)
+        if owns_importer:
+            importer.finish()
+    finally:
+        # asyncio.to_thread 가 쓴 스레드 풀까지 정리하고 닫는다
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+        stats.elapsed = time.perf_counter() - stats.started_at
+    return stats
+
@@ -0,0 +1,131 @@
+"""줄거리 기반 유사 웹툰 계산
+
+형태소 분석기 없이 한국어를 다루기 위해 줄거리를 어절 단위 문자 n-gram(2~3글자) 으로 쪼개고
+TF-IDF 희소 행렬(scipy.sparse CSR)을 만든다. 행을 L2 정규화한 뒤 배치 단위 희소 행렬곱으로
+코사인 유사도 top-k 이웃을 구해 artifact 로 저장한다 (similarity.py 와 같은 형식).
+
+같은 작품의 다른 플랫폼 연재본(canonical_work 가 같은 행)은 줄거리가 거의 같으므로
+자기 작품은 이웃에서 빼고, 다른 작품도 플랫폼별로 겹치지 않게 작품당 한 행만 남긴다.
+웹 프로세스는 artifacts.load_neighbors 로 memory-map 해서 읽기만 한다.
+"""
+import re
+import time
+import unicodedata
+
+import numpy as np
+from scipy import sparse
+
+from .artifacts import save_neighbors
+from .catalog import get_catalog_version
+from .models import Webtoon
+from .similarity import select_top_k
+
+SYNOPSIS_SIMILARITY = 'synopsis_similarity'
+DEFAULT_TOP_K = 20
+DEFAULT_BATCH_SIZE = 256  # 배치 하나가 (batch_size, 웹툰 수) float32 밀집 행렬이 된다
+NGRAM_RANGE = (2, 3)
+MIN_DF = 2  # 한 작품에만 나오는 n-gram 은 이웃을 찾는 데 쓸모가 없다
+MAX_DF_RATIO = 0.5  # 절반 넘는 줄거리에 나오는 n-gram 은 불용어 취급
+
+_non_word = re.compile(r'[^\w]+')
+
+
+def synopsis_ngrams(text, ngram_range=NGRAM_RANGE):
+    """줄거리 → 문자 n-gram 목록 (어절 앞뒤에 공백을 붙여 어절 경계를 살린다)"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    low, high = ngram_range
+    grams = []
+    for word in _non_word.sub(' ', text).split():
+        word = f' {word} '
+        for n in range(low, high + 1):
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+def build_tfidf_matrix(synopses, min_df=MIN_DF, max_df_ratio=MAX_DF_RATIO):
+    """(matrix, 어휘 수) — 행마다 L2 정규화된 sublinear TF-IDF CSR 행렬"""
+    vocabulary = {}
+    rows, cols = [], []
+    for row, text in enumerate(synopses):
+        grams = synopsis_ngrams(text)
+        cols.extend(vocabulary.setdefault(gram, len(vocabulary)) for gram in grams)
+        rows.extend([row] * len(grams))
+
+    n = len(synopses)
+    counts = sparse.csr_matrix(
+        (np.ones(len(cols), dtype=np.float32), (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+        shape=(n, len(vocabulary)),
+    )
+    counts.sum_duplicates()
+
+    # 문서 빈도로 어휘를 거른다
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    keep = np.flatnonzero((df >= min_df) & (df <= max(max_df_ratio * n, min_df)))
+    counts = counts[:, keep]
+    df = df[keep]
+
+    matrix = counts.copy()
+    matrix.data = 1 + np.log(matrix.data)
+    idf = (np.log((1 + n) / (1 + df)) + 1).astype(np.float32)
+    matrix = (matrix @ sparse.diags(idf)).tocsr()
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix = sparse.diags(1 / norms).astype(np.float32) @ matrix
+    return matrix.tocsr().astype(np.float32), int(len(keep))
+
+
+def sparse_top_k_neighbors(matrix, groups, k=DEFAULT_TOP_K, batch_size=DEFAULT_BATCH_SIZE):
+    """L2 정규화된 CSR 행렬에서 행마다 같은 그룹(자기 자신 포함)을 빼고 그룹당 하나씩 코사인 top-k (행 번호, 점수)"""
+    n = matrix.shape[0]
+    k = min(k, max(n - 1, 0))
+    neighbors = np.full((n, k), -1, dtype=np.int64)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return neighbors, scores
+
+    # 한 작품이 여러 플랫폼 행으로 겹쳐 나올 수 있으므로 넉넉히 뽑은 뒤 작품당 하나만 남긴다
+    candidates = min(2 * k, n - 1)
+    transposed = matrix.T.tocsr()
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        sims = (matrix[start:stop] @ transposed).toarray()
+        sims[groups[start:stop, None] == groups[None, :]] = -np.inf
+        part, part_scores = select_top_k(sims, candidates)
+        for offset, (cols, col_scores) in enumerate(zip(part, part_scores)):
+            _, first = np.unique(groups[cols], return_index=True)
+            first = np.sort(first)[:k]
+            neighbors[start + offset, :len(first)] = cols[first]
+            scores[start + offset, :len(first)] = col_scores[first]
+
+    # 겹치는 n-gram 이 없는 이웃은 빈 칸으로
+    neighbors[scores <= 0] = -1
+    scores[scores <= 0] = 0
+    return neighbors, scores
+
+
+def build_synopsis_similarity(k=DEFAULT_TOP_K, batch_size=DEFAULT_BATCH_SIZE):
+    started = time.perf_counter()
+    version = get_catalog_version()
+    rows = list(Webtoon.objects.order_by('id').values_list('id', 'canonical_work', 'synopsis'))
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    # 묶인 작품이 없으면 자기 자신만의 그룹 (-id 는 canonical_work 와 겹치지 않는다)
+    groups = np.array(
+        [work if work is not None else -pk for pk, work, _ in rows], dtype=np.int64,
+    )
+    matrix, features = build_tfidf_matrix([row[2] for row in rows])
+    neighbors, scores = sparse_top_k_neighbors(matrix, groups, k=k, batch_size=batch_size)
+
+    # 행 번호 → 웹툰 id
+    neighbor_ids = np.where(neighbors >= 0, ids[np.clip(neighbors, 0, None)], -1)
+    path = save_neighbors(
+        SYNOPSIS_SIMILARITY, ids, neighbor_ids, scores,
+        catalog_version=version, features=features, ngram_range=list(NGRAM_RANGE),
+    )
+    return {
+        'path': str(path),
+        'webtoons': int(len(ids)),
+        'features': features,
+        'k': int(neighbors.shape[1]),
+        'elapsed': time.perf_counter() - started,
+    }
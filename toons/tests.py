@@ -1,3 +1,771 @@
-from django.test import TestCase
+import gc
+import json
+import os
+import shutil
+import stat
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .artifacts import load_neighbors, save_neighbors
+from .benchmark import CSV_COLUMNS
+from .catalog import bump_catalog_version, get_catalog_version
+from . import favorites as favorite_service
+from .history import ViewBuffer
+from .metrics import Registry
+from .importers import CatalogImporter, normalize_genres
+from .models import FacetCount, Favorite, FavoriteBucket, Genre, Webtoon, WebtoonTombstone
+from .search import FTS_TABLE, search_webtoons
+from .similarity import build_genre_similarity
+from .synopsis import build_synopsis_similarity
+from .suggest import SuggestIndex
+from .sync import SyncError, sync_provider
+from .trending import current_hour, record_favorite_adds, trending_webtoons
+from .works import build_canonical_works, resolve_works
+
+SYNC_PAGES_DIR = Path(settings.BASE_DIR) / 'fixtures' / 'sync_pages'
+
+CATALOG_ROWS = [
+    {
+        'titleName': '참교육', 'Url': 'https://comic.naver.com/webtoon/list?titleId=758037&tab=mon',
+        'thumbnailUrl': 'https://image-comic.pstatic.net/webtoon/758037/thumbnail/thumbnail_IMAG21_old.jpg',
+        'is_adult': False, 'Writer': '채용택', 'Painter': '한가람', 'Original': '',
+        'synopsis': '무너진 교권을 지키기 위해 교권보호국 소속 나화진의 참교육이 시작된다!',
+        'genre': 'ACTION, 사이다, 액션, 학원물', 'day': '월', 'provider': 'NAVER',
+    },
+    {
+        'titleName': '환생천마', 'Url': 'https://comic.naver.com/webtoon/list?titleId=822657&tab=mon',
+        'thumbnailUrl': 'https://image-comic.pstatic.net/webtoon/822657/thumbnail/thumbnail_IMAG21_99e49512-e05d-48c3-846d-d898f78523df.jpg',
+        'is_adult': False, 'Writer': 'JP', 'Painter': '부겸', 'Original': '장영훈',
+        'synopsis': "철혈의 맹주, 강호의 절대자 '천하진'. 가문의 수치라 불리는 망나니의 몸으로 깨어나다!",
+        'genre': 'HISTORICAL, 무협/사극, 액션, 환생', 'day': '월', 'provider': 'NAVER',
+    },
+]
+
+
+def import_rows(rows, importer=None):
+    importer = importer or CatalogImporter()
+    importer.import_chunk(pd.DataFrame(rows, columns=CSV_COLUMNS))
+    return importer.finish()
+
+
+class ImporterTests(TestCase):
+    def test_skip_update_and_prune(self):
+        stats = import_rows(CATALOG_ROWS)
+        self.assertEqual((stats.created, stats.updated, stats.skipped), (2, 0, 0))
+        self.assertEqual(stats.genres_created, Genre.objects.count())
+        first = Webtoon.objects.get(title='참교육')
+
+        # 같은 내용은 건너뛰고 revision 도 그대로
+        stats = import_rows(CATALOG_ROWS)
+        self.assertEqual((stats.created, stats.updated, stats.skipped, stats.genres_created), (0, 0, 2, 0))
+        self.assertEqual(Webtoon.objects.get(pk=first.pk).revision, first.revision)
+
+        # 줄거리만 바뀐 행은 갱신, 장르 연결은 새 태그 기준
+        changed = dict(CATALOG_ROWS[0], synopsis='새 줄거리', genre='학원물')
+        importer = CatalogImporter()
+        importer.import_chunk(pd.DataFrame([changed], columns=CSV_COLUMNS))
+        self.assertEqual(importer.prune({'NAVER'}), 1)
+        stats = importer.finish()
+        self.assertEqual((stats.updated, stats.removed), (1, 1))
+
+        webtoon = Webtoon.objects.get(pk=first.pk)
+        self.assertEqual(webtoon.synopsis, '새 줄거리')
+        self.assertGreater(webtoon.revision, first.revision)
+        self.assertEqual(list(webtoon.genres.values_list('tag', flat=True)), ['학원/캠퍼스/청춘'])
+        self.assertFalse(Webtoon.objects.filter(title='환생천마').exists())
+        self.assertEqual(WebtoonTombstone.objects.count(), 1)
+        self.assertEqual(
+            dict(FacetCount.objects.filter(provider='NAVER', facet='genre').values_list('value', 'count')),
+            {'학원/캠퍼스/청춘': 1},
+        )
+
+
+    def test_normalize_genres_follows_alias_changes(self):
+        rows = [dict(CATALOG_ROWS[0], genre='능글, 액션')]
+        import_rows(rows)
+        webtoon = Webtoon.objects.get()
+        self.assertEqual(normalize_genres(), 0)
+        self.assertEqual(list(webtoon.genres.values_list('tag', flat=True)), ['액션/무협'])
+
+        with mock.patch.dict('toons.genres.TAG_ALIASES', {'능글': '로맨스'}):
+            self.assertEqual(normalize_genres(), 1)
+        self.assertEqual(sorted(webtoon.genres.values_list('tag', flat=True)), ['로맨스/연애', '액션/무협'])
+        self.assertEqual(
+            dict(FacetCount.objects.filter(facet='genre').values_list('value', 'count')),
+            {'로맨스/연애': 1, '액션/무협': 1},
+        )
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    """녹화해 둔 korea-webtoon-api 페이지를 돌려준다 (server.failures 에 넣은 응답을 먼저)"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        provider, page = query['provider'][0], int(query['page'][0])
+        self.server.requests.append(page)
+        failures = self.server.failures.get(page)
+        if failures:
+            status, content_type, body = failures.pop(0)
+        else:
+            path = SYNC_PAGES_DIR / f'{provider}-{page}.json'
+            body = path.read_text(encoding='utf-8') if path.exists() else '{"webtoons": []}'
+            status, content_type = 200, 'application/json'
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class SyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubApiHandler)
+        self.server.requests = []
+        self.server.failures = {}
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}/'
+
+        self.sleeps = []
+
+        async def no_sleep(delay):
+            self.sleeps.append(delay)
+
+        patcher = mock.patch('toons.sync.asyncio.sleep', no_sleep)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sync(self, **kwargs):
+        return sync_provider('NAVER', base_url=self.base_url, concurrency=2, timeout=5, backoff=0.5, **kwargs)
+
+    def test_merges_recorded_pages_with_retries(self):
+        import_rows(CATALOG_ROWS)
+        existing = Webtoon.objects.get(title='참교육')
+        links = (existing.genres.count(), existing.raw_genres.count(), existing.credits.count())
+        untouched_revision = Webtoon.objects.get(title='환생천마').revision
+
+        self.server.failures[2] = [
+            (503, 'text/plain', 'busy'),
+            (200, 'text/html', '<html>gateway error</html>'),
+        ]
+        stats = self.sync()
+
+        self.assertEqual(stats.pages, 2)
+        self.assertEqual(stats.items, 4)
+        self.assertEqual(stats.saved, 2)
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+        self.assertEqual(sorted(self.server.requests), [1, 2, 2, 2, 3, 4])
+
+        # API 가 준 필드만 바뀌고 줄거리/작가/장르 연결은 그대로
+        existing.refresh_from_db()
+        self.assertEqual(existing.update_days, '월, 목')
+        self.assertTrue(existing.thumbnail.endswith('thumbnail_IMAG21_new.jpg'))
+        self.assertEqual(existing.synopsis, CATALOG_ROWS[0]['synopsis'])
+        self.assertEqual((existing.writers, existing.painters), ('채용택', '한가람'))
+        self.assertEqual(
+            (existing.genres.count(), existing.raw_genres.count(), existing.credits.count()), links,
+        )
+        self.assertEqual(Webtoon.objects.get(title='환생천마').revision, untouched_revision)
+
+        created = Webtoon.objects.get(title='새로 연재하는 웹툰')
+        self.assertEqual((created.writers, created.painters), ('홍길동', '홍길동'))
+        self.assertEqual(created.credits.count(), 2)
+        self.assertFalse(Webtoon.objects.filter(title='전지적 독자 시점').exists())
+
+        # 같은 페이지를 다시 받으면 바뀐 게 없다
+        self.assertEqual(self.sync().saved, 0)
+
+    def test_non_json_page_raises_sync_error(self):
+        self.server.failures[1] = [(200, 'text/html', '<html>maintenance</html>')] * 3
+        with self.assertRaises(SyncError):
+            self.sync(retries=2)
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+        self.assertFalse(Webtoon.objects.exists())
+
+
+    def test_failed_page_waits_for_the_rest_of_the_wave(self):
+        self.server.failures[1] = [(404, 'text/plain', 'gone')]
+        self.server.failures[2] = [(503, 'text/plain', 'busy')] * 2
+        with self.assertNoLogs('asyncio', level='ERROR'):
+            with self.assertRaises(SyncError):
+                self.sync(retries=2)
+            gc.collect()
+        # 2 페이지는 재시도까지 마친 뒤에 오류가 올라온다
+        self.assertEqual(sorted(self.server.requests), [1, 2, 2, 2])
+
+class SearchTests(TestCase):
+    def setUp(self):
+        import_rows(CATALOG_ROWS)
+
+    def titles(self, q):
+        return list(search_webtoons(Webtoon.objects.all(), q).values_list('title', flat=True))
+
+    def test_trigram_match_on_synopsis_and_authors(self):
+        self.assertEqual(self.titles('교권보호'), ['참교육'])
+        self.assertEqual(self.titles('장영훈'), ['환생천마'])
+        self.assertEqual(self.titles('없는검색어'), [])
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(self.titles('천마'), ['환생천마'])
+        self.assertEqual(self.titles('교육 채용택'), ['참교육'])
+        self.assertEqual(sorted(self.titles('의')), ['참교육', '환생천마'])
+
+    def test_index_follows_search_columns_only(self):
+        webtoon = Webtoon.objects.get(title='참교육')
+        Webtoon.objects.filter(pk=webtoon.pk).update(title='참교육 시즌2')
+        self.assertEqual(self.titles('시즌2'), ['참교육 시즌2'])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT sql FROM sqlite_master WHERE name = '{FTS_TABLE}_au'")
+            self.assertIn('AFTER UPDATE OF title', cursor.fetchone()[0])
+        # 카운터 갱신은 색인을 다시 쓰지 않아도 검색 결과가 그대로
+        Webtoon.objects.filter(pk=webtoon.pk).update(favorites_count=F('favorites_count') + 1)
+        self.assertEqual(self.titles('시즌2'), ['참교육 시즌2'])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        import_rows(CATALOG_ROWS)
+        self.webtoon = Webtoon.objects.get(title='참교육')
+
+    def test_list_etag_follows_catalog_and_favorites(self):
+        url = '/api/webtoons/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # 카탈로그가 바뀌면 새 ETag
+        bump_catalog_version()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # 로그인 사용자는 즐겨찾기가 바뀌어도 새 ETag (is_favorite 가 응답에 들어가므로)
+        user = get_user_model().objects.create_user(username='reader', email='reader@example.com', password='pw')
+        self.client.force_login(user)
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        favorite_service.toggle_favorite(user, self.webtoon)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class RecentViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        import_rows(CATALOG_ROWS)
+        self.webtoon = Webtoon.objects.get(title='참교육')
+        self.user = get_user_model().objects.create_user(username='reader', email='reader@example.com', password='pw')
+        self.client.force_login(self.user)
+        # 타이머 flush 없이 버퍼에 쌓인 것만 본다
+        self.buffer = ViewBuffer(flush_size=1000, flush_seconds=3600)
+        patcher = mock.patch('toons.history.buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_not_modified_detail_is_recorded(self):
+        url = f'/api/webtoons/{self.webtoon.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.buffer.pending.clear()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(list(self.buffer.pending_for(self.user.pk)), [self.webtoon.pk])
+
+
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        import_rows(CATALOG_ROWS)
+        self.webtoon = Webtoon.objects.get(title='참교육')
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com', password='pw')
+            for i in range(2)
+        ]
+
+    def ranking(self):
+        cache.clear()
+        webtoons, adds, _ = trending_webtoons('24h', 'ALL', 10)
+        return [(w.title, adds[w.pk]) for w in webtoons]
+
+    def test_toggle_loop_does_not_inflate(self):
+        for _ in range(5):
+            favorite_service.toggle_favorite(self.users[0], self.webtoon)
+            favorite_service.toggle_favorite(self.users[0], self.webtoon)
+        favorite_service.apply_favorites_batch(self.users[0], add=[self.webtoon.pk])
+        favorite_service.apply_favorites_batch(self.users[0], remove=[self.webtoon.pk])
+        self.assertEqual(self.ranking(), [])
+
+        favorite_service.toggle_favorite(self.users[0], self.webtoon)
+        favorite_service.apply_favorites_batch(self.users[1], add=[self.webtoon.pk])
+        self.assertEqual(self.ranking(), [('참교육', 2)])
+
+    def test_remove_subtracts_from_the_hour_it_was_added(self):
+        added_at = timezone.now() - timedelta(hours=3)
+        Favorite.objects.create(user=self.users[0], webtoon=self.webtoon, created_at=added_at)
+        favorite_service.rebuild_popularity_counters()
+        record_favorite_adds([self.webtoon.pk], now=added_at)
+        self.assertEqual(self.ranking(), [('참교육', 1)])
+
+        self.assertFalse(favorite_service.toggle_favorite(self.users[0], self.webtoon))
+        bucket = FavoriteBucket.objects.get(webtoon=self.webtoon)
+        self.assertEqual((bucket.hour, bucket.count), (current_hour(added_at), 0))
+        self.assertEqual(self.ranking(), [])
+
+    def test_removing_favorite_from_before_buckets_keeps_other_adds(self):
+        # 0011 이전에 추가된 즐겨찾기 (추가 시각 모름)
+        Favorite.objects.create(user=self.users[0], webtoon=self.webtoon, created_at=None)
+        favorite_service.rebuild_popularity_counters()
+        favorite_service.toggle_favorite(self.users[1], self.webtoon)
+        self.assertEqual(self.ranking(), [('참교육', 1)])
+
+        self.assertFalse(favorite_service.toggle_favorite(self.users[0], self.webtoon))
+        self.assertEqual(self.ranking(), [('참교육', 1)])
+        self.webtoon.refresh_from_db()
+        self.assertEqual(self.webtoon.favorites_count, 1)
+
+
+class FavoriteCounterTests(TestCase):
+    def setUp(self):
+        import_rows(CATALOG_ROWS)
+        self.first, self.second = Webtoon.objects.order_by('id')
+        self.user = get_user_model().objects.create_user(
+            username='reader', email='reader@example.com', password='pw', gender='F',
+        )
+
+    def counters(self, webtoon):
+        webtoon.refresh_from_db()
+        return webtoon.favorites_count, webtoon.favorites_female_count, webtoon.favorites_male_count
+
+    def test_toggle_moves_counters_and_version(self):
+        self.assertTrue(favorite_service.toggle_favorite(self.user, self.first))
+        self.assertEqual(self.counters(self.first), (1, 1, 0))
+        self.assertEqual(self.user.favorites_version, 1)
+
+        self.assertFalse(favorite_service.toggle_favorite(self.user, self.first))
+        self.assertEqual(self.counters(self.first), (0, 0, 0))
+        self.assertEqual(self.user.favorites_version, 2)
+        self.assertEqual(favorite_service.rebuild_popularity_counters(), 0)
+
+    def test_batch_only_counts_real_changes(self):
+        favorite_service.toggle_favorite(self.user, self.first)
+        added, removed, missing = favorite_service.apply_favorites_batch(
+            self.user, add=[self.first.pk, self.second.pk, 999999],
+        )
+        self.assertEqual((added, removed, missing), ([self.second.pk], [], [999999]))
+        self.assertEqual(self.counters(self.first), (1, 1, 0))
+        self.assertEqual(self.counters(self.second), (1, 1, 0))
+
+        version = self.user.favorites_version
+        self.assertEqual(favorite_service.apply_favorites_batch(self.user, add=[self.second.pk]), ([], [], []))
+        self.assertEqual(self.user.favorites_version, version)
+
+        self.client.force_login(self.user)
+        response = self.client.post(
+            '/api/me/favorites/batch', {'remove': [self.first.pk, self.second.pk]}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['removed'], [self.first.pk, self.second.pk])
+        self.assertEqual(self.counters(self.first), (0, 0, 0))
+        self.assertEqual(self.counters(self.second), (0, 0, 0))
+        self.assertEqual(favorite_service.rebuild_popularity_counters(), 0)
+
+
+def numbered_rows(count, provider='NAVER'):
+    return [
+        {
+            'titleName': f'테스트 웹툰 {i}', 'Url': f'https://example.com/{provider}/{i}', 'thumbnailUrl': '',
+            'is_adult': False, 'Writer': f'작가{i}', 'Painter': f'작가{i}', 'Original': '',
+            'synopsis': '', 'genre': '드라마', 'day': '월', 'provider': provider,
+        }
+        for i in range(count)
+    ]
+
+
+class QueryCountTests(TestCase):
+    """목록 / 내 즐겨찾기는 페이지 크기, 즐겨찾기 수와 상관없이 쿼리 수가 같아야 한다 (N+1 없음)"""
+
+    def setUp(self):
+        import_rows(numbered_rows(30))
+        self.webtoons = list(Webtoon.objects.order_by('id'))
+        self.user = get_user_model().objects.create_user(username='reader', email='reader@example.com', password='pw')
+        self.client.force_login(self.user)
+        self.client.get('/api/webtoons/')  # catalog_ready 는 프로세스에 한 번만 확인
+
+    def assertQueries(self, count, url, params=None):
+        cache.clear()
+        with self.assertNumQueries(count):
+            self.assertEqual(self.client.get(url, params).status_code, 200)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        for webtoon in self.webtoons[:10]:
+            favorite_service.toggle_favorite(self.user, webtoon)
+        # 세션, 사용자, 카탈로그 버전, COUNT, 목록, 즐겨찾기 여부
+        for per_page in (5, 30):
+            with self.subTest(per_page=per_page):
+                self.assertQueries(6, '/api/webtoons/', {'per_page': per_page})
+
+    def test_my_favorites_query_count_does_not_grow_with_favorites(self):
+        # 세션, 사용자, 카탈로그 버전, 즐겨찾기 목록
+        for webtoon in self.webtoons[:3]:
+            favorite_service.toggle_favorite(self.user, webtoon)
+        self.assertQueries(4, '/api/me/favorites/')
+        for webtoon in self.webtoons[3:]:
+            favorite_service.toggle_favorite(self.user, webtoon)
+        self.assertQueries(4, '/api/me/favorites/')
+
+
+class ScheduleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        rows = numbered_rows(5)
+        for row, day in zip(rows, ['월, 목', '화', '', '월', '월요일']):
+            row['day'] = day
+        rows[3]['is_adult'] = True
+        import_rows(rows)
+        self.ids = list(Webtoon.objects.order_by('url').values_list('id', flat=True))
+
+    def test_weekly_schedule_groups_by_day(self):
+        both, tuesday, completed, adult, monday = self.ids
+        days = self.client.get('/api/webtoons/schedule/').json()['days']
+        self.assertEqual(list(days), ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'])
+        # 연재 요일이 없는(완결/휴재) 웹툰과 성인 웹툰은 빠지고, 요일마다 최신 순
+        self.assertEqual([w['id'] for w in days['mon']], [monday, both])
+        self.assertEqual([w['id'] for w in days['tue']], [tuesday])
+        self.assertEqual([w['id'] for w in days['thu']], [both])
+        self.assertEqual(days['sun'], [])
+        listed = {w['id'] for items in days.values() for w in items}
+        self.assertFalse(listed & {completed, adult})
+
+    def test_single_day(self):
+        both, _, _, _, monday = self.ids
+        for day in ('mon', '월', 'MONDAY'):
+            with self.subTest(day=day):
+                response = self.client.get('/api/webtoons/schedule/', {'day': day})
+                self.assertEqual(response.json()['day'], 'mon')
+                self.assertEqual([w['id'] for w in response.json()['results']], [monday, both])
+        self.assertEqual(self.client.get('/api/webtoons/schedule/', {'day': 'someday'}).status_code, 400)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        import_rows(numbered_rows(7))
+
+    def walk(self, **params):
+        ids, cursor = [], ''
+        for _ in range(10):
+            response = self.client.get('/api/webtoons/', {'cursor': cursor, 'per_page': 3, **params})
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.json()['results'])
+            cursor = response.json()['next']
+            if not cursor:
+                return ids
+        self.fail('cursor 가 끝나지 않음')
+
+    def test_latest_round_trip(self):
+        expected = list(Webtoon.objects.order_by('-id').values_list('id', flat=True))
+        self.assertEqual(self.walk(), expected)
+
+    def test_popular_round_trip_keeps_counter_order(self):
+        for count, webtoon in zip([3, 0, 5, 3, 1, 0, 3], Webtoon.objects.order_by('id')):
+            Webtoon.objects.filter(pk=webtoon.pk).update(favorites_count=count)
+        expected = list(Webtoon.objects.order_by('-favorites_count', '-id').values_list('id', flat=True))
+        self.assertEqual(self.walk(sort='popular'), expected)
+
+    def test_invalid_requests(self):
+        latest_cursor = self.client.get('/api/webtoons/', {'cursor': '', 'per_page': 3}).json()['next']
+        for params in [
+            {'cursor': '', 'q': '테스트'},
+            {'cursor': latest_cursor, 'sort': 'popular'},
+            {'cursor': 'not-a-cursor'},
+            {'cursor': '', 'per_page': 0},
+            {'per_page': -1},
+            {'page': 'x'},
+        ]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/webtoons/', params).status_code, 400)
+
+
+class ResolveWorksTests(TestCase):
+    def test_chain_does_not_merge_same_provider(self):
+        rows = [
+            (1, 'KAKAO', '루시아'),
+            (2, 'KAKAOPAGE', '루시아'),
+            (3, 'KAKAOPAGE', '루시아 [19세 완전판]'),
+            (4, 'NAVER', '루시아'),
+        ]
+        authors = {1: {'작가'}, 2: {'작가'}, 3: {'작가'}, 4: {'작가'}}
+        works = resolve_works(rows, authors)
+        self.assertEqual(works[1], works[2])
+        self.assertEqual(works[1], works[4])
+        self.assertEqual(works[3], 3)
+
+    def test_merged_rows_show_up_in_change_feed(self):
+        rows = [dict(CATALOG_ROWS[0]), dict(CATALOG_ROWS[0], Url='https://page.kakao.com/content/1', provider='KAKAOPAGE')]
+        import_rows(rows)
+        since = get_catalog_version()
+
+        self.assertEqual(build_canonical_works()['changed'], 2)
+        body = json.loads(b''.join(self.client.get('/api/webtoons/changes/', {'since': since}).streaming_content))
+        self.assertEqual(sorted(body['changed']), sorted(Webtoon.objects.values_list('id', flat=True)))
+        self.assertEqual(body['added'], [])
+
+    def test_best_author_match_wins(self):
+        rows = [(10, 'NAVER', '같은 제목'), (11, 'KAKAO', '같은 제목'), (12, 'KAKAO', '같은 제목')]
+        authors = {10: {'홍길동'}, 11: {'홍길동님'}, 12: {'홍길동'}}
+        works = resolve_works(rows, authors)
+        self.assertEqual(works[12], 10)
+        self.assertEqual(works[11], 11)
+
+
+class ArtifactTests(TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = override_settings(WEBTOON_ARTIFACT_DIR=str(self.root))
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def save(self, score):
+        return save_neighbors('test_similarity', [1, 2], [[2], [1]], [[score], [score]])
+
+    def test_publishes_through_symlink_and_keeps_previous_version(self):
+        self.save(0.1)
+        first = load_neighbors('test_similarity')
+        self.save(0.2)
+        self.save(0.3)
+
+        target = self.root / 'test_similarity'
+        self.assertTrue(target.is_symlink())
+        [(neighbor, score)] = load_neighbors('test_similarity').lookup(1)
+        self.assertEqual(neighbor, 2)
+        self.assertAlmostEqual(score, 0.3, places=5)
+        # 현재 + 바로 이전 버전만 남는다
+        self.assertEqual(len([p for p in self.root.iterdir() if p.is_dir() and not p.is_symlink()]), 2)
+        self.assertNotEqual(first.path, load_neighbors('test_similarity').path)
+
+        umask = os.umask(0)
+        os.umask(umask)
+        self.assertEqual(stat.S_IMODE(target.resolve().stat().st_mode), 0o777 & ~umask)
+
+    def test_replaces_legacy_directory(self):
+        legacy = self.root / 'test_similarity'
+        legacy.mkdir()
+        (legacy / 'meta.json').write_text('{}')
+        self.save(0.5)
+        self.assertTrue(legacy.is_symlink())
+        self.assertEqual(load_neighbors('test_similarity').lookup(2), [(1, 0.5)])
+        self.assertFalse(any('legacy' in p.name for p in self.root.iterdir()))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.registry = Registry()
+        patcher = mock.patch('toons.metrics.registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_streaming_queries_are_counted_after_the_body(self):
+        import_rows(CATALOG_ROWS)
+        response = self.client.get('/api/webtoons/changes/', {'since': 0})
+        key = ('api-webtoon-changes', 'GET')
+        self.assertNotIn(key, self.registry.histograms['webtoon_db_queries_per_request'])
+
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(body['added']), 2)
+        # 응답을 만든 뒤 본문을 내보내며 도는 id 조회 3개
+        self.assertGreaterEqual(self.registry.histograms['webtoon_db_queries_per_request'][key].sum, 3)
+
+    def test_metrics_endpoint_is_not_public(self):
+        # 같은 호스트의 프록시 뒤에서는 모든 요청이 127.0.0.1 로 보인다
+        local = {'REMOTE_ADDR': '127.0.0.1'}
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get('/api/metrics', **local).status_code, 403)
+        with self.settings(WEBTOON_METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get('/api/metrics', HTTP_AUTHORIZATION='Bearer wrong', **local).status_code, 403)
+            self.assertEqual(self.client.get('/api/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+        with self.settings(WEBTOON_METRICS_PUBLIC=True):
+            self.assertEqual(self.client.get('/api/metrics').status_code, 200)
+
+        staff = get_user_model().objects.create_user(username='ops', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get('/api/metrics', **local).status_code, 200)
+
+
+class SuggestTests(TestCase):
+    def test_mixed_syllable_and_chosung_prefix(self):
+        import_rows(CATALOG_ROWS)
+        index = SuggestIndex(version=0)
+        for q in ['참교', '참ㄱ', 'ㅊ교', 'ㅊㄱㅇ', '참ㄱ육', 'ㅎ생천마']:
+            with self.subTest(q=q):
+                titles = [w['title'] for w in index.suggest(q)['webtoons']]
+                self.assertEqual(titles, ['환생천마' if 'ㅎ' in q else '참교육'])
+        self.assertEqual(index.suggest('참ㄴ')['webtoons'], [])
+        self.assertEqual(index.suggest('참교ㅇ')['webtoons'][0]['title'], '참교육')
+        self.assertEqual(index.suggest('차ㄱ')['webtoons'], [])
+
+
+class QueryParamTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        import_rows(CATALOG_ROWS)
+        self.webtoon = Webtoon.objects.get(title='참교육')
+
+    def assertRejected(self, url, *bad_params):
+        for params in bad_params:
+            with self.subTest(url=url, params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
+
+    def test_author_endpoints(self):
+        author = self.webtoon.credits.first().author
+        self.assertRejected('/api/authors/', {'name': author.name, 'limit': 'x'}, {'name': author.name, 'limit': -1})
+        url = f'/api/authors/{author.pk}/webtoons/'
+        self.assertRejected(url, {'per_page': 0}, {'per_page': 'x'}, {'page': 'x'}, {'page': 0})
+
+        response = self.client.get('/api/authors/', {'name': author.name, 'limit': 1000})
+        self.assertEqual(response.json()['results'][0]['name'], author.name)
+        self.assertEqual(self.client.get(url, {'per_page': 1000}).json()['count'], 1)
+
+    @mock.patch('toons.suggest._index', None)
+    def test_suggest_limit(self):
+        self.assertRejected('/api/webtoons/suggest/', {'q': '참', 'limit': 'x'}, {'q': '참', 'limit': -1})
+        response = self.client.get('/api/webtoons/suggest/', {'q': '참', 'limit': 1000})
+        self.assertEqual([w['title'] for w in response.json()['webtoons']], ['참교육'])
+
+    def test_trending_limit(self):
+        self.assertRejected('/api/webtoons/trending/', {'limit': 'x'}, {'limit': -1}, {'limit': 0})
+        self.assertEqual(self.client.get('/api/webtoons/trending/', {'limit': 1000}).status_code, 200)
+
+    def test_recent_limit(self):
+        user = get_user_model().objects.create_user(username='reader', email='reader@example.com', password='pw')
+        self.client.force_login(user)
+        self.assertRejected('/api/me/recent/', {'limit': 'x'}, {'limit': -1})
+        self.assertEqual(self.client.get('/api/me/recent/', {'limit': 1000}).json()['results'], [])
+
+    def test_popular_segment(self):
+        self.assertRejected('/api/webtoons/', {'sort': 'popular', 'segment': 'X'})
+        other = Webtoon.objects.exclude(pk=self.webtoon.pk).first()
+        Webtoon.objects.filter(pk=self.webtoon.pk).update(favorites_count=5, favorites_female_count=1)
+        Webtoon.objects.filter(pk=other.pk).update(favorites_count=2, favorites_female_count=2)
+
+        for segment, first in (('', self.webtoon), ('f', other)):
+            with self.subTest(segment=segment):
+                cache.clear()
+                response = self.client.get('/api/webtoons/', {'sort': 'popular', 'segment': segment})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['results'][0]['id'], first.pk)
+
+    def test_similar_limit(self):
+        for kind in ('similar', 'similar-story'):
+            self.assertRejected(f'/api/webtoons/{self.webtoon.pk}/{kind}/', {'limit': 'x'}, {'limit': 0})
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        override = override_settings(WEBTOON_ARTIFACT_DIR=root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        rows = numbered_rows(5)
+        for row, genre in zip(rows, ['액션, 무협', '액션, 무협', '액션', '로맨스', '액션, 무협']):
+            row['genre'] = genre
+        rows[4]['is_adult'] = True
+        import_rows(rows)
+        self.webtoons = list(Webtoon.objects.order_by('url'))
+        build_genre_similarity()
+
+        self.user = get_user_model().objects.create_user(username='reader', email='reader@example.com', password='pw')
+        self.client.force_login(self.user)
+
+    def test_recommends_by_favorite_genres(self):
+        favorite, same, partial, other, adult = self.webtoons
+        favorite_service.toggle_favorite(self.user, favorite)
+
+        response = self.client.get('/api/me/recommendations/')
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        # 즐겨찾기한 작품, 성인 작품, 장르가 겹치지 않는 작품은 빠지고 겹치는 정도 순
+        self.assertEqual([item['id'] for item in results], [same.pk, partial.pk])
+        self.assertGreater(results[0]['score'], results[1]['score'])
+
+        self.assertEqual(len(self.client.get('/api/me/recommendations/', {'limit': 1}).json()['results']), 1)
+        for limit in ('x', 0, -1):
+            with self.subTest(limit=limit):
+                self.assertEqual(self.client.get('/api/me/recommendations/', {'limit': limit}).status_code, 400)
+
+
+class SynopsisSimilarityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root, ignore_errors=True)
+        override = override_settings(WEBTOON_ARTIFACT_DIR=root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        rows = numbered_rows(6)
+        for row, synopsis in zip(rows, [
+            '검은 용의 기사가 왕국을 지키는 이야기',
+            '검은 용의 기사가 제국을 지키는 이야기',
+            '하얀 용의 전설',
+            '바다 고양이 카페의 일상',
+            '고양이 카페 사장님의 하루',
+            '우주 해적의 모험',
+        ]):
+            row['synopsis'] = synopsis
+        import_rows(rows)
+        self.ids = list(Webtoon.objects.order_by('url').values_list('id', flat=True))
+        build_synopsis_similarity()
+
+    def test_similar_story_order_excludes_itself(self):
+        knight, rival, legend, cafe, cafe_owner, _ = self.ids
+        results = self.client.get(f'/api/webtoons/{knight}/similar-story/').json()['results']
+        self.assertEqual([item['id'] for item in results], [rival, legend])
+        self.assertGreater(results[0]['score'], results[1]['score'])
+
+        results = self.client.get(f'/api/webtoons/{cafe}/similar-story/').json()['results']
+        self.assertEqual([item['id'] for item in results][0], cafe_owner)
+        self.assertNotIn(cafe, [item['id'] for item in results])
+
+
+class CatalogNotReadyTests(TestCase):
+    @mock.patch('toons.catalog._ready', False)
+    def test_empty_catalog_answers_503_without_importing(self):
+        for url in ('/api/webtoons/', '/api/webtoons/schedule/', '/api/webtoons/trending/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response.json()['code'], 'catalog_not_ready')
+                self.assertIn('Retry-After', response)
+        self.assertFalse(Webtoon.objects.exists())
+
+    def test_missing_similarity_artifact_answers_503(self):
+        import_rows(CATALOG_ROWS)
+        webtoon = Webtoon.objects.get(title='참교육')
+        with tempfile.TemporaryDirectory() as root, self.settings(WEBTOON_ARTIFACT_DIR=root):
+            response = self.client.get(f'/api/webtoons/{webtoon.pk}/similar/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['code'], 'similarity_not_ready')
@@ -0,0 +1,114 @@
+"""급상승 웹툰 (최근 24시간 / 7일 즐겨찾기 추가 수)
+
+즐겨찾기가 추가될 때마다 FavoriteBucket 의 (웹툰, 정시) 칸을 1 올리고, 해제되면
+추가됐던 시간의 칸을 1 내린다 (favorites.py). 그래서 버킷은 시간별 순 추가 수다.
+순위는 즐겨찾기 테이블이 아니라 최근 7일치 버킷만 더해서 계산하고,
+(기간, 플랫폼) 별 top-N 을 캐시에 TRENDING_REFRESH_SECONDS 동안 들고 있는다.
+7일보다 오래된 버킷은 순위를 다시 계산할 때 함께 지운다.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .catalog import ALL_PROVIDERS
+from .models import FavoriteBucket, Webtoon
+
+WINDOWS = {'24h': timedelta(hours=24), '7d': timedelta(days=7)}
+BUCKET_RETENTION = max(WINDOWS.values())
+TRENDING_SIZE = 100  # 미리 계산해 두는 순위 길이
+TRENDING_REFRESH_SECONDS = 5 * 60
+
+
+def current_hour(now=None):
+    return (now or timezone.now()).replace(minute=0, second=0, microsecond=0)
+
+
+def record_favorite_adds(webtoon_ids, now=None):
+    """즐겨찾기 추가를 이번 시간 버킷에 더한다 (즐겨찾기 추가와 같은 트랜잭션에서 호출)"""
+    hour = current_hour(now)
+    webtoon_ids = set(webtoon_ids)
+    buckets = FavoriteBucket.objects.filter(hour=hour)
+    existing = set(buckets.filter(webtoon_id__in=webtoon_ids).values_list('webtoon_id', flat=True))
+    if existing:
+        buckets.filter(webtoon_id__in=existing).update(count=F('count') + 1)
+
+    missing = webtoon_ids - existing
+    if not missing:
+        return
+    try:
+        with transaction.atomic():
+            FavoriteBucket.objects.bulk_create([
+                FavoriteBucket(webtoon_id=webtoon_id, hour=hour, count=1) for webtoon_id in missing
+            ])
+    except IntegrityError:
+        # 다른 요청이 방금 같은 칸을 만들었음 → 하나씩 다시
+        for webtoon_id in missing:
+            if not buckets.filter(webtoon_id=webtoon_id).update(count=F('count') + 1):
+                FavoriteBucket.objects.create(webtoon_id=webtoon_id, hour=hour, count=1)
+
+
+def record_favorite_removes(removed):
+    """해제된 즐겨찾기 [(webtoon_id, 추가된 시각)] 를 추가됐던 시간 버킷에서 뺀다 (0 아래로는 안 내려감)
+
+    추가/해제를 반복해도 순위가 오르지 않도록 버킷에는 순 추가 수만 남긴다.
+    보관 기간이 지났거나 버킷 기록 전(마이그레이션 전)에 추가된 즐겨찾기는 뺄 칸이 없다.
+    추가 시각을 모르는(created_at 이 NULL 인) 즐겨찾기는 건너뛴다.
+    """
+    by_hour = {}
+    for webtoon_id, added_at in removed:
+        if added_at is None:
+            continue
+        by_hour.setdefault(current_hour(added_at), []).append(webtoon_id)
+    for hour, webtoon_ids in by_hour.items():
+        FavoriteBucket.objects.filter(
+            hour=hour, webtoon_id__in=webtoon_ids, count__gt=0,
+        ).update(count=F('count') - 1)
+
+
+def compute_trending(window, provider, limit=TRENDING_SIZE, now=None):
+    """[(webtoon_id, 기간 내 추가 수)] (많은 순)"""
+    since = current_hour(now) - WINDOWS[window] + timedelta(hours=1)
+    buckets = FavoriteBucket.objects.filter(hour__gte=since, webtoon__is_adult=False)
+    if provider != ALL_PROVIDERS:
+        buckets = buckets.filter(webtoon__provider=provider)
+    rows = (
+        buckets.values('webtoon_id').annotate(adds=Sum('count')).filter(adds__gt=0)
+        .order_by('-adds', '-webtoon_id')[:limit]
+    )
+    return [(row['webtoon_id'], row['adds']) for row in rows]
+
+
+def prune_buckets(now=None):
+    """보관 기간이 지난 버킷 삭제"""
+    cutoff = current_hour(now) - BUCKET_RETENTION
+    deleted, _ = FavoriteBucket.objects.filter(hour__lt=cutoff).delete()
+    return deleted
+
+
+def trending(window, provider):
+    """캐시된 (기간, 플랫폼) 순위. 없거나 오래됐으면 버킷에서 다시 계산"""
+    key = f'trending:{window}:{provider}'
+    data = cache.get(key)
+    if data is None:
+        prune_buckets()
+        data = {
+            'refreshed_at': timezone.now().isoformat(),
+            'ranking': compute_trending(window, provider),
+        }
+        cache.set(key, data, TRENDING_REFRESH_SECONDS)
+    return data
+
+
+def trending_webtoons(window, provider, limit):
+    """(Webtoon 목록, {id: 추가 수}, refreshed_at)"""
+    data = trending(window, provider)
+    ranking = data['ranking'][:limit]
+    webtoons = Webtoon.objects.in_bulk([webtoon_id for webtoon_id, _ in ranking])
+    return (
+        [webtoons[webtoon_id] for webtoon_id, _ in ranking if webtoon_id in webtoons],
+        dict(ranking),
+        data['refreshed_at'],
+    )
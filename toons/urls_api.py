@@ -1,9 +1,22 @@
 from django.urls import path
-from .api_views import webtoon_list, webtoon_detail, toggle_favorite, my_favorites
+from .metrics import metrics_view
+from .api_views import webtoon_list, webtoon_suggest, webtoon_trending, webtoon_schedule, webtoon_changes, webtoon_detail, similar_webtoons, similar_story_webtoons, author_lookup, author_webtoons, toggle_favorite, my_favorites, favorites_batch, my_recent, my_recommendations
 
 urlpatterns = [
     path('webtoons/', webtoon_list, name='api-webtoon-list'),
+    path('webtoons/suggest/', webtoon_suggest, name='api-webtoon-suggest'),
+    path('webtoons/trending/', webtoon_trending, name='api-webtoon-trending'),
+    path('webtoons/schedule/', webtoon_schedule, name='api-webtoon-schedule'),
+    path('webtoons/changes/', webtoon_changes, name='api-webtoon-changes'),
     path('webtoons/<int:webtoon_id>/', webtoon_detail, name='api-webtoon-detail'),
+    path('webtoons/<int:webtoon_id>/similar/', similar_webtoons, name='api-similar-webtoons'),
+    path('webtoons/<int:webtoon_id>/similar-story/', similar_story_webtoons, name='api-similar-story-webtoons'),
     path('webtoons/<int:webtoon_id>/favorite/', toggle_favorite, name='api-toggle-favorite'),
+    path('authors/', author_lookup, name='api-author-lookup'),
+    path('authors/<int:author_id>/webtoons/', author_webtoons, name='api-author-webtoons'),
     path('me/favorites/', my_favorites, name='api-my-favorites'),
+    path('me/favorites/batch', favorites_batch, name='api-favorites-batch'),
+    path('me/recent/', my_recent, name='api-my-recent'),
+    path('me/recommendations/', my_recommendations, name='api-my-recommendations'),
+    path('metrics', metrics_view, name='api-metrics'),
 ]
@@ -1,73 +1,37 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.db.models import Q
-import requests
 from .models import Webtoon
-
-PLATFORM_API = {
-    'NAVER': 'https://korea-webtoon-api.onrender.com/webtoons?provider=NAVER&page=1&perPage=100&sort=ASC',
-    'KAKAO': 'https://korea-webtoon-api.onrender.com/webtoons?provider=KAKAO&page=1&perPage=100&sort=ASC',
-    'KAKAO_PAGE': 'https://korea-webtoon-api.onrender.com/webtoons?provider=KAKAO_PAGE&page=1&perPage=100&sort=ASC'
-}
-
-def fetch_webtoons_all_pages(provider):
-    all_webtoons = []
-    for page in range(1, 51):
-        url = f'https://korea-webtoon-api.onrender.com/webtoons?provider={provider}&page={page}&perPage=100&sort=ASC'
-        resp = requests.get(url)
-        page_items = resp.json().get('webtoons', [])
-        # 빈 페이지라면 더 이상 요청하지 않음
-        if not page_items:
-            break
-        all_webtoons.extend(page_items)
-    return all_webtoons
-
-def filter_webtoons_with_updateDays(webtoons):
-    # 업데이트 요일이 하나 이상 존재하는 웹툰만 남김
-    return [toon for toon in webtoons if toon.get('updateDays')]
-
-def sync_webtoons(provider):
-    all_webtoons = fetch_webtoons_all_pages(provider)
-    valid_webtoons = filter_webtoons_with_updateDays(all_webtoons)
-    # 이미 저장된 웹툰은 중복 저장 방지
-    for toon in valid_webtoons:
-        Webtoon.objects.update_or_create(
-            url=toon['url'],
-            defaults={
-                'provider': provider,
-                'title': toon['title'].strip(),
-                'authors': ','.join(toon.get('authors', [])),
-                'update_days': ','.join(toon['updateDays']),
-                'thumbnail': toon['thumbnail'][0] if toon.get('thumbnail') else '',
-                'is_end': toon['isEnd'],
-            }
-        )
+from .search import search_webtoons
+from .history import recent_webtoons
+from . import favorites as favorite_service
 
 def webtoon_list(request):
     platform = request.GET.get('platform', 'NAVER')
     query = request.GET.get('q', '')
     
-    # [1] DB에 플랫폼별 웹툰이 없으면 API로 불러와서 동기화/저장
-    if not Webtoon.objects.filter(provider=platform).exists():
-        sync_webtoons(platform)
-
-    # [2] DB에서 검색·필터링
+    # 동기화는 warm_catalog 명령으로 미리 한다 (요청 중에는 하지 않음)
+    # DB에서 검색·필터링
     qs = Webtoon.objects.filter(provider=platform).exclude(update_days='')
     
     if platform in ['KAKAO', 'KAKAO_PAGE']:
         qs = qs.filter(is_end=False)
 
     if query:
-        qs = qs.filter(
-            Q(title__icontains=query) |
-            Q(authors__icontains=query)
-        )
+        qs = search_webtoons(qs, query)
 
     webtoons = qs.all()
 
+    # 카드마다 favorited_by.all 을 읽지 않도록 내 즐겨찾기 id 를 한 번에
+    favorite_ids = set()
+    if request.user.is_authenticated:
+        favorite_ids = set(
+            request.user.favorite_webtoons.filter(provider=platform).values_list('id', flat=True)
+        )
+
     context = {
         'webtoons': webtoons,
+        'favorite_ids': favorite_ids,
         'platform': platform,
         'query': query,
     }
@@ -81,21 +45,20 @@ def toggle_favorite(request, webtoon_id):
     
     webtoon = get_object_or_404(Webtoon, id=webtoon_id)
     
-    # 즐겨찾기 토글
-    if request.user in webtoon.favorited_by.all():
-        webtoon.favorited_by.remove(request.user)
-        is_favorited = False
-        message = '즐겨찾기에서 제거되었습니다.'
-    else:
-        webtoon.favorited_by.add(request.user)
-        is_favorited = True
+    # 즐겨찾기 토글 (인기 카운터도 함께 갱신)
+    is_favorited = favorite_service.toggle_favorite(request.user, webtoon)
+    if is_favorited:
         message = '즐겨찾기에 추가되었습니다.'
+    else:
+        message = '즐겨찾기에서 제거되었습니다.'
     
+    # 관계 테이블 COUNT 대신 토글 때 함께 갱신한 카운터 컬럼
+    webtoon.refresh_from_db(fields=['favorites_count'])
     context = {
         'success': True,
         'is_favorited': is_favorited,
         'message': message,
-        'favorites_count': webtoon.favorited_by.count()
+        'favorites_count': webtoon.favorites_count
     }
     
     return JsonResponse(context)
@@ -123,15 +86,15 @@ def my_page(request):
         
         # 검색
         if query:
-            favorite_webtoons = favorite_webtoons.filter(
-                Q(title__icontains=query) | Q(authors__icontains=query)
-            )
+            favorite_webtoons = search_webtoons(favorite_webtoons, query)
         
         context['webtoons'] = favorite_webtoons
     
+    elif tab == 'recent':
+        # 최근 본 웹툰 (최근 순, 사용자당 WEBTOON_HISTORY_SIZE 개)
+        context['webtoons'] = recent_webtoons(request.user)
+    
     # 추후 다른 탭 추가 가능
-    # elif tab == 'recent':
-    #     최근 본 웹툰
     # elif tab == 'comments':
     #     내가 단 댓글
     
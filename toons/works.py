@@ -0,0 +1,173 @@
+"""플랫폼 간 같은 작품 묶기 (canonical_work)
+
+NAVER/KAKAO/KAKAOPAGE 에 동시에 올라온 작품을 하나의 canonical_work 로 묶는다.
+모든 쌍을 비교하지 않도록 정규화한 제목이 같은 행끼리만 블록으로 모으고,
+블록 안에서 플랫폼이 다른 행끼리 작가 이름을 느슨하게 비교한다.
+한 묶음에는 플랫폼마다 한 행만 들어간다.
+묶음의 id 는 묶음 안에서 가장 작은 웹툰 id 이고, 혼자인 작품은 자기 id 를 쓴다.
+"""
+import re
+import time
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .catalog import bump_catalog_version
+from .models import Webtoon, WebtoonAuthor
+
+AUTHOR_SIMILARITY = 0.8  # 작가 이름 유사도 (SequenceMatcher ratio) 기준
+UPDATE_BATCH_SIZE = 1000
+
+# [독점], (개정판), <시즌2> 처럼 제목 뒤에 붙는 괄호 표기
+_BRACKETS = re.compile(r'[\[\(<【〈「].*?[\]\)>】〉」]')
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_title(title):
+    """블로킹 키: 괄호 표기/공백/문장부호를 지우고 소문자로"""
+    text = unicodedata.normalize('NFKC', str(title or '')).lower()
+    stripped = _NON_WORD.sub('', _BRACKETS.sub('', text))
+    # 제목 전체가 괄호였으면 괄호만 지운 것으로
+    return stripped or _NON_WORD.sub('', text)
+
+
+def normalize_author(name):
+    return _NON_WORD.sub('', unicodedata.normalize('NFKC', name).lower())
+
+
+def author_similarity(a, b):
+    """작가 이름 집합 두 개의 유사도 (0~1). 한쪽이 비었으면 제목만으로 판단하므로 기준값"""
+    if not a or not b:
+        return AUTHOR_SIMILARITY
+    if a & b:
+        return 1.0
+    return max(SequenceMatcher(None, x, y).ratio() for x in a for y in b)
+
+
+def authors_match(a, b):
+    """작가 이름 집합 두 개가 같은 작품으로 볼 만큼 겹치는지"""
+    return author_similarity(a, b) >= AUTHOR_SIMILARITY
+
+
+class _UnionFind:
+    """묶음마다 들어 있는 플랫폼을 같이 들고 있어서, 한 묶음에 같은 플랫폼이 두 번 들어가지 않게 한다"""
+
+    def __init__(self):
+        self.parent = {}
+        self.providers = {}
+
+    def add(self, x, provider):
+        self.providers[x] = {provider}
+
+    def find(self, x):
+        root = x
+        while self.parent.get(root, root) != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent.get(x, x)
+        return root
+
+    def union(self, a, b):
+        """합쳤으면 True. 이미 같은 묶음이거나 두 묶음에 겹치는 플랫폼이 있으면 False"""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb or self.providers[ra] & self.providers[rb]:
+            return False
+        # 작은 id 를 대표로
+        root, child = min(ra, rb), max(ra, rb)
+        self.parent[child] = root
+        self.providers[root] |= self.providers.pop(child)
+        return True
+
+
+def resolve_works(rows, authors_by_id):
+    """[(id, provider, title)] → {id: canonical_work}
+
+    union-find 는 전이적이라 A(NAVER)-B(KAKAO), B-C(NAVER) 를 그대로 합치면 A 와 C 가 묶인다.
+    그래서 후보 쌍을 작가 유사도가 높은 순서로 합치고, 이미 같은 플랫폼이 들어 있는 묶음끼리는 합치지 않는다.
+    """
+    blocks = defaultdict(list)
+    works = _UnionFind()
+    for pk, provider, title in rows:
+        works.add(pk, provider)
+        key = normalize_title(title)
+        if key:
+            blocks[key].append((pk, provider))
+
+    candidates = []
+    for members in blocks.values():
+        for i, (a, provider_a) in enumerate(members):
+            for b, provider_b in members[i + 1:]:
+                # 같은 플랫폼 안의 동명 작품은 서로 다른 작품으로 본다
+                if provider_a == provider_b:
+                    continue
+                score = author_similarity(authors_by_id.get(a, set()), authors_by_id.get(b, set()))
+                if score >= AUTHOR_SIMILARITY:
+                    candidates.append((-score, a, b))
+
+    for _, a, b in sorted(candidates):
+        works.union(a, b)
+    return {pk: works.find(pk) for pk, _, _ in rows}
+
+
+def build_canonical_works():
+    """전체 카탈로그의 canonical_work 를 다시 계산하고 바뀐 행만 저장한다"""
+    started = time.perf_counter()
+    rows = list(Webtoon.objects.values_list('id', 'provider', 'title'))
+
+    authors_by_id = defaultdict(set)
+    for webtoon_id, name in WebtoonAuthor.objects.values_list('webtoon_id', 'author__name'):
+        authors_by_id[webtoon_id].add(normalize_author(name))
+
+    resolved = resolve_works(rows, authors_by_id)
+    current = dict(Webtoon.objects.values_list('id', 'canonical_work'))
+    changed = [
+        Webtoon(id=pk, canonical_work=work)
+        for pk, work in resolved.items()
+        if current.get(pk) != work
+    ]
+    if changed:
+        with transaction.atomic():
+            # canonical_work 도 응답에 나가므로 변경 피드(/api/webtoons/changes/)에 잡히게 revision 을 찍는다
+            revision = bump_catalog_version()
+            now = timezone.now()
+            for webtoon in changed:
+                webtoon.revision = revision
+                webtoon.updated_at = now
+            Webtoon.objects.bulk_update(
+                changed, ['canonical_work', 'revision', 'updated_at'], batch_size=UPDATE_BATCH_SIZE,
+            )
+
+    return {
+        'webtoons': len(rows),
+        'merged': sum(1 for pk, work in resolved.items() if pk != work),
+        'works': len(set(resolved.values())),
+        'changed': len(changed),
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+def attach_available_on(items):
+    """직렬화 결과에 같은 작품이 연재되는 플랫폼 목록을 붙인다 (쿼리 1번)"""
+    works = {item['canonical_work'] for item in items if item.get('canonical_work')}
+    providers = defaultdict(set)
+    for work, provider in (
+        Webtoon.objects.filter(canonical_work__in=works)
+        .values_list('canonical_work', 'provider').distinct()
+    ):
+        providers[work].add(provider)
+    for item in items:
+        item['available_on'] = sorted(providers.get(item.get('canonical_work'), {item['provider']}))
+    return items
+
+
+def dedupe_works(queryset):
+    """같은 작품은 (필터를 통과한 것 중) 가장 최근 id 한 행만 남긴다"""
+    latest = queryset.order_by().values(
+        work=Coalesce('canonical_work', 'id', output_field=BigIntegerField()),
+    ).annotate(latest=Max('id')).values('latest')
+    return queryset.filter(id__in=latest)